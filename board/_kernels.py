@@ -0,0 +1,146 @@
+"""
+Flat-array kernels shared by Board, Validator and the strategies.
+
+These are the hottest numeric loops of both solvers. They only touch
+plain lists and array('H') masks plus the lookup tables below, so they carry
+no dependency on Board and can be swapped for compiled versions.
+"""
+
+ALL_CANDIDATES = 0x3FE  # bits 1..9 set, bit n means candidate n
+
+# Lookup tables built once at import =========================================
+
+# (row, col) coordinates of the cells in each row, column and box
+ROW_CELLS = tuple(tuple((row, col) for col in range(9)) for row in range(9))
+COL_CELLS = tuple(tuple((row, col) for row in range(9)) for col in range(9))
+BOX_CELLS = tuple(
+    tuple((box_row + i, box_col + j) for i in range(3) for j in range(3))
+    for box_row in (0, 3, 6) for box_col in (0, 3, 6))
+
+# Box index of every flat cell index (row * 9 + col)
+BOX_OF = tuple((row // 3) * 3 + col // 3 for row in range(9) for col in range(9))
+
+# Unit ids (row, 9 + column, 18 + box) of every flat cell index
+CELL_UNITS = tuple((index // 9, 9 + index % 9, 18 + BOX_OF[index]) for index in range(81))
+
+# For every flat cell index, the (unit id, position bit) pair of its row, column
+# and box. The bit is the cell's offset within the unit: its column in the row,
+# its row in the column and its row-major place in the box.
+CELL_UNIT_BITS = tuple(
+  ((index // 9, 1 << index % 9),
+   (9 + index % 9, 1 << index // 9),
+   (18 + BOX_OF[index], 1 << (index // 9 % 3 * 3 + index % 3)))
+  for index in range(81))
+
+# Bitmask -> ascending tuple of its set bit indices. For a candidate mask these
+# are the digits it holds, for a unit position mask the cell offsets.
+SET_BITS = tuple(
+    tuple(bit for bit in range(10) if mask >> bit & 1) for mask in range(1 << 10))
+
+
+def _build_peers():
+  """Builds the 20 peer indices (row, column and box) of every flat cell index."""
+  peers = []
+  for row in range(9):
+    for col in range(9):
+      units = ROW_CELLS[row] + COL_CELLS[col] + BOX_CELLS[BOX_OF[row * 9 + col]]
+      cell_peers = {r * 9 + c for r, c in units}
+      cell_peers.discard(row * 9 + col)
+      peers.append(tuple(sorted(cell_peers)))
+  return tuple(peers)
+
+
+PEERS = _build_peers()
+
+# The same peers as an 81-bit mask per cell, bit j set if cell j is a peer
+PEER_MASKS = tuple(sum(1 << peer for peer in peers) for peers in PEERS)
+
+
+def insert_digit(candidates, row_mask, col_mask, box_mask, row, col, value):
+  """Records value at (row, col) in the unit masks and clears it from its peers."""
+  bit = 1 << value
+  index = row * 9 + col
+  clear = ~bit
+
+  row_mask[row] |= bit
+  col_mask[col] |= bit
+  box_mask[BOX_OF[index]] |= bit
+
+  candidates[index] = 0
+  for peer in PEERS[index]:
+    candidates[peer] &= clear
+
+
+def build_unit_positions(candidates):
+  """Returns, per digit and unit id, the mask of the unit's cells holding the digit.
+
+  Bits follow CELL_UNIT_BITS, so a row's mask is indexed by column, a column's
+  by row and a box's by the cell's offset in the box.
+  """
+  positions = [[0] * 27 for _ in range(10)]
+  for index, mask in enumerate(candidates):
+    if mask:
+      unit_bits = CELL_UNIT_BITS[index]
+      for digit in SET_BITS[mask]:
+        digit_positions = positions[digit]
+        for unit, bit in unit_bits:
+          digit_positions[unit] |= bit
+  return positions
+
+
+def clear_positions_on_insert(positions, candidates, index, value):
+  """Updates unit positions for value being placed at index; call before insert_digit.
+
+  The cell loses all of its candidates and every peer holding value loses it.
+  """
+  for digit in SET_BITS[candidates[index]]:
+    digit_positions = positions[digit]
+    for unit, bit in CELL_UNIT_BITS[index]:
+      digit_positions[unit] &= ~bit
+  value_positions = positions[value]
+  bit = 1 << value
+  for peer in PEERS[index]:
+    if candidates[peer] & bit:
+      for unit, unit_bit in CELL_UNIT_BITS[peer]:
+        value_positions[unit] &= ~unit_bit
+
+
+def unit_single_digits(candidates):
+  """Returns, for all 27 units, the mask of digits left in exactly one of its cells.
+
+  Units are numbered rows 0-8, columns 9-17 and boxes 18-26. One pass over the
+  board counts all nine digits of every unit at once: `once` collects the
+  digits seen so far in a unit and `twice` those seen again.
+  """
+  once = [0] * 27
+  twice = [0] * 27
+  for index, mask in enumerate(candidates):
+    if mask:
+      for unit in CELL_UNITS[index]:
+        twice[unit] |= once[unit] & mask
+        once[unit] |= mask
+  return [seen & ~again for seen, again in zip(once, twice)]
+
+
+def validate_cells(cells):
+  """Returns False as soon as a digit repeats in a row, column or box of cells."""
+  # Bitmask of the digits already seen in each row, column and 3x3 box
+  row_seen = [0] * 9
+  col_seen = [0] * 9
+  box_seen = [0] * 9
+  box_of = BOX_OF
+
+  index = 0
+  for r, row in enumerate(cells):
+    for c, value in enumerate(row):
+      if value != 0:
+        bit = 1 << value
+        b = box_of[index]
+        if (row_seen[r] | col_seen[c] | box_seen[b]) & bit:
+          return False
+        row_seen[r] |= bit
+        col_seen[c] |= bit
+        box_seen[b] |= bit
+      index += 1
+
+  return True
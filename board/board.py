@@ -1,80 +1,145 @@
+from array import array
 from board.colors import Colors
 from board.validator import Validator
-import copy
+from board._kernels import (ALL_CANDIDATES, ROW_CELLS, COL_CELLS, BOX_CELLS,
+                            BOX_OF, CELL_UNIT_BITS, PEERS, PEER_MASKS, SET_BITS,
+                            build_unit_positions, clear_positions_on_insert,
+                            insert_digit, unit_single_digits)
+
+# Candidate bitmask -> frozenset of the digits it holds
+MASK_DIGITS = tuple(
+    frozenset(num for num in range(1, 10) if mask >> num & 1)
+    for mask in range(1 << 10))
+
+# Maps the ASCII digits of a board string to the cell values 0-9
+_DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+# Display templates ===========================================================
+
+_BOX_BORDER = "+" + "---+" * 9
+_CELL_BORDER = "+" + "   +" * 9
+_ROW_FMT = "|" + " {}   {}   {} |" * 3
+
+_CANDIDATE_BORDER = "+" + ("═" * 9 + "+") * 9
+_CANDIDATE_MID_BORDER = "+" + ("-" * 9 + "+") * 9
+_CANDIDATE_ROW_FMT = "‖" + ((" {} " * 3 + "|") * 2 + " {} " * 3 + "‖") * 3
+
+# _CANDIDATE_SLOTS[line][mask]: the three slots a cell prints on that line
+_CANDIDATE_SLOTS = tuple(
+    tuple(
+        tuple(str(num) if mask >> num & 1 else " " for num in range(line * 3 + 1, line * 3 + 4))
+        for mask in range(1 << 10))
+    for line in range(3))
+
 
 class Board:
 
   def __init__(self, board_string):
-    self.cells = self.string_to_board(board_string)
-    self.original = copy.deepcopy(self.cells)
+    self.row_mask = array('H', [0] * 9)
+    self.col_mask = array('H', [0] * 9)
+    self.box_mask = array('H', [0] * 9)
+    self.filled_count = 0  # Number of non-empty cells, kept in step with inserts
+    self.cells_flat = self.string_to_board(board_string)
+    # Row views into cells_flat, so cells[row][col] reads and writes the flat buffer
+    self.cells = tuple(memoryview(self.cells_flat)[i:i + 9] for i in range(0, 81, 9))
+    self.original = bytes(self.cells_flat)
     self.candidates = self.initialize_candidates()
+    self.version = 0  # Bumped on every candidate change, keys strategy caches
+    # Per digit and unit id, the cells holding the digit as candidate; built on
+    # first use and then kept up to date, see get_unit_positions
+    self._unit_positions = None
+    self._positions_version = -1
+    # Cells snapshot and result of the last full validation, see is_valid
+    self._validated_cells = None
+    self._validated_result = False
     self.colors = Colors()
     self.validator = Validator()
 
     self.update_candidates_backtracking()
-    assert self.validator.validate(self.cells), "Illegal Numbers Input"
+    assert self.masks_match_cells(), "Illegal Numbers Input"
 
   def string_to_board(self, board_string):
-    """Converts a string representation of a Sudoku board to a 2D list."""
+    """Converts a string representation of a Sudoku board to a flat bytearray, 0 meaning empty."""
     assert len(board_string) == 81, "Illegal Board String"
-    assert all(char in '0123456789' for char in board_string), "Illegal Board String"
+    assert not board_string.strip('0123456789'), "Illegal Board String"
 
-    board = []
-    for i in range(0, len(board_string), 9):
-      row = [
-          int(char) if char != '0' else None for char in board_string[i:i + 9]
-      ]
-      board.append(row)
-    return board
+    return bytearray(board_string.encode('ascii').translate(_DIGIT_VALUES))
 
   def initialize_candidates(self):
-    """Initializes the candidates for each cell."""
-    candidates = [
-      [set(range(1, 10)) if cell is None else set() for cell in row] 
-        for row in self.cells]
-    return candidates
+    """Initializes the candidate bitmask for each cell as a flat array of 81."""
+    return array('H', [
+        ALL_CANDIDATES if cell == 0 else 0 for cell in self.cells_flat
+    ])
 
  # Candidate Functions ========================================================
 
+  def get_candidates(self, row, col):
+    """Returns the candidates of the cell at (row, col) as a frozenset."""
+    return MASK_DIGITS[self.candidates[row * 9 + col]]
+
+  def remove_candidate(self, row, col, num):
+    """Removes num from the candidates of the cell at (row, col)."""
+    index = row * 9 + col
+    self.candidates[index] &= ~(1 << num)
+    if self._positions_version == self.version:
+      num_positions = self._unit_positions[num]
+      for unit, bit in CELL_UNIT_BITS[index]:
+        num_positions[unit] &= ~bit
+      self._positions_version += 1
+    self.version += 1
+
   def update_candidates_on_insert(self, updated_row, updated_col):
     """Updates the candidates for each cell based on the new value inserted."""
-    inserted_value = self.cells[updated_row][updated_col]
-    
-    box_row_start = (updated_row // 3) * 3
-    box_col_start = (updated_col // 3) * 3
-
-    self.candidates[updated_row][updated_col] = set()
-
-    # Update candidates in the row
-    for col in range(9):
-        if col != updated_col:
-            self.candidates[updated_row][col].discard(inserted_value)
-
-    # Update candidates in the column
-    for row in range(9):
-        if row != updated_row:
-            self.candidates[row][updated_col].discard(inserted_value)
-
-    # Update candidates in the box
-    for row in range(box_row_start, box_row_start + 3):
-        for col in range(box_col_start, box_col_start + 3):
-            if row != updated_row or col != updated_col:
-                self.candidates[row][col].discard(inserted_value)
+    value = self.cells[updated_row][updated_col]
+    if self._positions_version == self.version:
+      clear_positions_on_insert(self._unit_positions, self.candidates,
+                                updated_row * 9 + updated_col, value)
+      self._positions_version += 1
+    insert_digit(self.candidates, self.row_mask, self.col_mask, self.box_mask,
+                 updated_row, updated_col, value)
+    self.filled_count += 1
+    self.version += 1
+
+  def get_unit_positions(self):
+    """Returns, per digit and unit id (rows 0-8, columns 9-17, boxes 18-26), the
+    mask of the unit's cells holding the digit as a candidate.
+
+    The table is built on first use and then updated in place by
+    remove_candidate and update_candidates_on_insert. Any other candidate change
+    (a backtracking restore, a full rebuild) bumps version without it, so the
+    next call rebuilds the table. Callers must not modify it.
+    """
+    if self._positions_version != self.version:
+      self._unit_positions = build_unit_positions(self.candidates)
+      self._positions_version = self.version
+    return self._unit_positions
+
+  def update_masks(self):
+    """Recomputes the row, column and box digit masks and the filled count from the cells."""
+    for i in range(9):
+      self.row_mask[i] = self.col_mask[i] = self.box_mask[i] = 0
+    self.filled_count = 0
+    for index, value in enumerate(self.cells_flat):
+      if value != 0:
+        self.filled_count += 1
+        bit = 1 << value
+        self.row_mask[index // 9] |= bit
+        self.col_mask[index % 9] |= bit
+        self.box_mask[BOX_OF[index]] |= bit
 
-  
   def update_candidates_backtracking(self):
-    """Updates the candidates for each cell based on the current board state."""
-    for row in range(9):
-      for col in range(9):
-        if self.cells[row][col] is None:
-          possible_numbers = set(range(1, 10))
-          possible_numbers -= self.get_row_numbers(row)
-          possible_numbers -= self.get_col_numbers(col)
-          possible_numbers -= self.get_box_numbers(row, col)
-          self.candidates[row][col] = possible_numbers
-        else:
-          self.candidates[row][col] = set()
-         
+    """Rebuilds every cell's candidates from the unit masks of the current board state."""
+    self.update_masks()
+    row_mask, col_mask, box_mask = self.row_mask, self.col_mask, self.box_mask
+    candidates = self.candidates
+    for index, value in enumerate(self.cells_flat):
+      if value == 0:
+        used = row_mask[index // 9] | col_mask[index % 9] | box_mask[BOX_OF[index]]
+        candidates[index] = ~used & ALL_CANDIDATES
+      else:
+        candidates[index] = 0
+    self.version += 1
+
   # Validator Functions =======================================================
   
   def check_placement(self, num, row, col):
@@ -84,110 +149,86 @@ class Board:
     return self.validator.check_placement(num, row_nums, col_nums, box_nums)
  
   def is_solved(self):
-    return self.validator.is_solved(self.cells)
+    return 0 not in self.cells_flat and self.is_valid()
   
   def is_valid(self):
-    """Check if the current board state is valid."""
-    return self.validator.validate(self.cells)
+    """Check if the current board state is valid.
+
+    The result is kept along with a snapshot of the cells, so repeated checks of
+    an unchanged board skip the validator. Cells can be written directly (the
+    backtracking solver does), so the snapshot is compared instead of version.
+    """
+    cells = bytes(self.cells_flat)
+    if cells != self._validated_cells:
+      self._validated_result = self.validator.validate(self.cells)
+      self._validated_cells = cells
+    return self._validated_result
+
+  def masks_match_cells(self):
+    """Checks, right after update_masks, that no digit repeats in a unit.
+
+    A repeated digit shows up only once in its unit's mask, so the digits in the
+    row, column and box masks each add up to filled_count exactly when the board
+    is valid. This replaces a full validator pass over the cells.
+    """
+    filled = self.filled_count
+    return (sum(mask.bit_count() for mask in self.row_mask) == filled
+            and sum(mask.bit_count() for mask in self.col_mask) == filled
+            and sum(mask.bit_count() for mask in self.box_mask) == filled)
   
   
   # Getter Functions ==========================================================
 
+  def get_empty_count(self):
+    """Returns the number of empty cells, from the filled count kept in step with inserts."""
+    return 81 - self.filled_count
+
   def get_row(self,row):
     return self.cells[row]
           
   def get_row_numbers(self, row):
-    """Returns a set of numbers present in the specified row."""
-    return {
-        self.cells[row][col]
-        for col in range(9) if self.cells[row][col] is not None
-    }
+    """Returns a bitmask of the numbers present in the specified row."""
+    return self.row_mask[row]
   
   def get_col_list(self,col):
-    return [row[col] for row in self.cells]
+    """Returns the cells of the specified column (0 for empty) as a bytearray."""
+    return self.cells_flat[col::9]
 
   def get_col_numbers(self, col):
-    """Returns a set of numbers present in the specified column."""
-    return {
-        self.cells[row][col]
-        for row in range(9) if self.cells[row][col] is not None
-    }
+    """Returns a bitmask of the numbers present in the specified column."""
+    return self.col_mask[col]
 
   def get_box_numbers(self, row, col):
-    """Returns a set of numbers in the 3x3 box containing the cell at (row, col)."""
-    box_row_start = (row // 3) * 3
-    box_col_start = (col // 3) * 3
-    box_numbers = {
-        self.cells[r][c]
-        for r in range(box_row_start, box_row_start + 3)
-        for c in range(box_col_start, box_col_start + 3)
-        if self.cells[r][c] is not None
-    }
-    return box_numbers
+    """Returns a bitmask of the numbers in the 3x3 box containing the cell at (row, col)."""
+    return self.box_mask[BOX_OF[row * 9 + col]]
   
 
   # Display Functions====================================================================
 
   def display_board(self):
     """Display the board with original values in red"""
-    print("+" + "---+" * 9)
+    red = self.colors.red
+    print(_BOX_BORDER)
     for i, row in enumerate(self.cells):
-      formatted_row = []
-
-      for j in range(9):
-        cell_value = self.cells[i][j]
-        original_value = self.original[i][j]
-
-        if cell_value == original_value and cell_value is not None:
-          formatted_value = self.colors.red(str(cell_value))
-        else:
-          formatted_value = " " if cell_value is None else str(cell_value)
-
-        formatted_row.append(formatted_value)
-
-      print(("|" + " {}   {}   {} |" * 3).format(*formatted_row))
-
-      if i % 3 == 2:
-        print("+" + "---+" * 9)
-      else:
-        print("+" + "   +" * 9)
+      original_row = self.original[i * 9:i * 9 + 9]
+      formatted_row = [
+          " " if value == 0
+          else red(str(value)) if value == original_row[j]
+          else str(value)
+          for j, value in enumerate(row)
+      ]
+      print(_ROW_FMT.format(*formatted_row))
+      print(_BOX_BORDER if i % 3 == 2 else _CELL_BORDER)
 
   def display_candidates(self):
     """TODO: Update to a GUI"""
-    row_list = [num for row in self.candidates for num in self.get_candidate_row(row)]
-    border = "+" + ("═" * 9 + "+") * 9
-    mid_border = "+" + ("-" * 9 + "+") * 9
-
-    print(border)
-    for i, row in enumerate(row_list):
-        if i > 0:
-            if i % 9 == 0:
-                print(border)
-            elif i % 3 == 0:
-                print(mid_border)
-        
-        row_string = '‖'
-        for j, num in enumerate(row, 1):
-            row_string += f" {num} "
-            if j % 9 == 0:
-                row_string += '‖'
-            elif j % 3 == 0:
-                row_string += '|'
-        
-        print(row_string)
-    
-    print(border)
-
-  def get_candidate_row(self, candidates_row):
-    rows = []
-    for i in range(3):
-      row = []
-      for candidates in candidates_row:
-        for num in range(i * 3 + 1, i * 3 + 4):
-          if num in candidates:
-            row.append(num)
-          else:
-            row.append(" ")
-      rows.append(row)
-    return rows
-
+    candidates = self.candidates
+    print(_CANDIDATE_BORDER)
+    for row in range(9):
+      if row > 0:
+        print(_CANDIDATE_BORDER if row % 3 == 0 else _CANDIDATE_MID_BORDER)
+      masks = candidates[row * 9:row * 9 + 9]
+      # Each cell prints as three lines of three candidate slots
+      for slots in _CANDIDATE_SLOTS:
+        print(_CANDIDATE_ROW_FMT.format(*[num for mask in masks for num in slots[mask]]))
+    print(_CANDIDATE_BORDER)
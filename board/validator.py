@@ -1,3 +1,5 @@
+from board._kernels import validate_cells
+
 class Validator:
 
   def __init__(self):
@@ -6,50 +8,15 @@ class Validator:
  
   def is_solved(self, cells):
     """Check if the board is completely filled AND valid."""
-    # First check if all cells are filled
-    if any(value is None for row in cells for value in row):
-        return False
-    
-    # Then check if the solution is valid
-    return self.validate(cells)
+    # First check if all cells are filled, then check if the solution is valid
+    return all(0 not in row for row in cells) and self.validate(cells)
 
  
   def check_placement(self, num, row_nums, col_nums, box_nums):
-      """Check if placing num at board[row][col] is valid."""
-      if num in row_nums:
-          return False
-      if num in col_nums:
-          return False
-      if num in box_nums:
-          return False
-      return True
+      """Check if placing num at board[row][col] is valid, given the digit bitmasks of its units."""
+      return not (1 << num) & (row_nums | col_nums | box_nums)
 
 
   def validate(self, cells):
     """Checks if the current board state is a valid Sudoku."""
-
-    def is_valid_group(group):
-      """Check if a group (row, column, or 3x3 box) is valid."""
-      values = [num for num in group if num is not None]
-      return len(values) == len(set(values))
-
-    # Check rows
-    for row in cells:
-      if not is_valid_group(row):
-        return False
-
-    # Check columns
-    for col in range(9):
-      if not is_valid_group([cells[row][col] for row in range(9)]):
-        return False
-
-    # Check 3x3 boxes
-    for box_row in range(0, 9, 3):
-      for box_col in range(0, 9, 3):
-        box_values = [
-            cells[box_row + r][box_col + c] for r in range(3) for c in range(3)
-        ]
-        if not is_valid_group(box_values):
-          return False
-
-    return True
\ No newline at end of file
+    return validate_cells(cells)
\ No newline at end of file
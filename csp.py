@@ -1,5 +1,4 @@
 import itertools
-from copy import deepcopy
 
 BLANK_STATE = 0
 
@@ -62,6 +61,12 @@ def generate_domain_board(board):
     return possible
 
 
+def copy_possible_matrix(possible):
+    # Only the domain lists are ever modified, so copy those and keep the None markers;
+    # much cheaper than a deepcopy, which walks every int and tracks a memo
+    return [[None if value_list is None else value_list[:] for value_list in row] for row in possible]
+
+
 # Most Constrained Variable (MCV) also called Minimum Remaining Values (MRV)
 def mrv_heuristic(possible):
     # Get most suitable variable (Box location) and its domain (Possible values)
@@ -154,7 +159,7 @@ def csp(board, possible=None, step=1):
             board[row_index][column_index] = num
 
             # Update possible matrix
-            new_possible = update_possible_matrix(deepcopy(possible), row_index, column_index, num)
+            new_possible = update_possible_matrix(copy_possible_matrix(possible), row_index, column_index, num)
 
             # Move on to next best variable
             board, step = csp(board, new_possible, step + 1)
@@ -31,13 +31,13 @@ def sudoku_cells_reduce_noise(digit_inv):
     # Calculate area threshold based on 1% of total area
     frac = 0.010
     area_thresh = total_area * frac
-    # Filter contours over 5 pixel square area
-    cnts = [cnt for cnt in cnts if cv2.contourArea(cnt) > area_thresh]
+    # Filter contours over 5 pixel square area, measuring each contour once
+    cnt_areas = [(area, cnt) for cnt in cnts if (area := cv2.contourArea(cnt)) > area_thresh]
 
     # Check if any contour is detected
-    if cnts:
-        # Sort to largest contour (Digit)
-        cnt = sorted(cnts, key=lambda x: cv2.contourArea(x), reverse=True)[0]
+    if cnt_areas:
+        # Largest contour (Digit), the first one on ties like a stable sort
+        cnt = max(cnt_areas, key=lambda area_cnt: area_cnt[0])[1]
         # Get coordinates, width, height of contour
         x, y, width, height = cv2.boundingRect(cnt)
 
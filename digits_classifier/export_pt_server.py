@@ -0,0 +1,34 @@
+"""
+    Saves the quantized TorchScript digit classifier used by website.py
+    Loading it skips rebuilding and scripting the model on every server start
+    Also exports the model to ONNX, website.py serves that through ONNX Runtime when it is installed
+"""
+
+import torch
+from helper_functions_pt import MNISTClassifier, load_scripted_model, get_custom_test_dataset_loader
+
+
+device = "cpu"
+model_path = "models/pt_cnn/ft_model_epoch12"
+
+# Sudoku digits to calibrate the int8 activation ranges on, all of the data
+calibration_loader = get_custom_test_dataset_loader("test", None, 64)
+
+# Statically quantize & script the trained model, convolutions included
+scripted_model = load_scripted_model(model_path + ".pth", device, calibration_loader)
+
+# Not frozen or optimized here, website.py runs optimize_for_inference after loading
+output_path = model_path + ".ts"
+torch.jit.save(scripted_model, output_path)
+print(f"Saved TorchScript model to {output_path}")
+
+# Float model for ONNX Runtime, which applies its own graph fusions, batch size left dynamic
+model = MNISTClassifier().to(device)
+model.load_state_dict(torch.load(model_path + ".pth", map_location=device))
+model.eval()
+onnx_path = model_path + ".onnx"
+torch.onnx.export(model, torch.zeros(1, 1, 28, 28, device=device), onnx_path,
+                  input_names=["input"], output_names=["logits"],
+                  dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+                  opset_version=17)
+print(f"Saved ONNX model to {onnx_path}")
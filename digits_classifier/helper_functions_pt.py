@@ -8,20 +8,46 @@ import matplotlib.pyplot as plt
 from torch.utils.data import DataLoader, random_split
 from torchvision.datasets import ImageFolder
 from digits_classifier import sudoku_cells_reduce_noise
-from PIL import Image
 from matplotlib.ticker import MultipleLocator
 
 
+# Mean and std of mnist digit dataset
+MNIST_MEAN = 0.1307
+MNIST_STD = 0.3081
+
+
 def get_mnist_transform():
     transform = torchvision.transforms.Compose([
         # Convert to pytorch image tensor
         torchvision.transforms.ToTensor(),
         # Mean and std of mnist digit dataset
-        torchvision.transforms.Normalize((0.1307,), (0.3081,)),
+        torchvision.transforms.Normalize((MNIST_MEAN,), (MNIST_STD,)),
     ])
     return transform
 
 
+def digits_to_batch(digits, out=None):
+    """
+    Same normalization as get_mnist_transform, applied to a whole stack of digits at once
+
+    :param digits: type: numpy.ndarray
+    uint8 digit images of shape [N,28,28]
+
+    :param out: type: torch.Tensor
+    Optional float tensor of shape [M,1,28,28], M >= N, to write the batch into instead of allocating one
+
+    :return: type: torch.Tensor
+    Float tensor of shape [N,1,28,28], a view of out when given
+    """
+    if out is None:
+        batch = torch.from_numpy(digits).float().unsqueeze(1)
+    else:
+        # copy_ converts uint8 to float on the way into the buffer
+        batch = out[:len(digits)]
+        batch[:, 0].copy_(torch.from_numpy(digits))
+    return batch.div_(255).sub_(MNIST_MEAN).div_(MNIST_STD)
+
+
 def get_mnist_dataset_loader(save_path, train, transform, batch_size):
     # Target transform = remap the remaining labels from 1-9 to 0-8
     dataset = torchvision.datasets.MNIST(save_path,
@@ -80,19 +106,28 @@ class MNISTClassifier(nn.Module):
         self.dropout2 = nn.Dropout(0.5)
         self.fc1 = nn.Linear(9216, 128)
         self.fc2 = nn.Linear(128, 9)
+        # Module activations (no parameters) so each conv/fc can be fused with its ReLU before quantizing
+        self.relu1 = nn.ReLU()
+        self.relu2 = nn.ReLU()
+        self.relu3 = nn.ReLU()
+        # Identity until the model is statically quantized, see load_scripted_model
+        self.quant = torch.ao.quantization.QuantStub()
+        self.dequant = torch.ao.quantization.DeQuantStub()
 
     def forward(self, x):
+        x = self.quant(x)
         x = self.conv1(x)
-        x = F.relu(x)
+        x = self.relu1(x)
         x = self.conv2(x)
-        x = F.relu(x)
+        x = self.relu2(x)
         x = F.max_pool2d(x, 2)
         x = self.dropout1(x)
         x = torch.flatten(x, 1)
         x = self.fc1(x)
-        x = F.relu(x)
+        x = self.relu3(x)
         x = self.dropout2(x)
         x = self.fc2(x)
+        x = self.dequant(x)
         output = F.log_softmax(x, dim=1)
         return output
 
@@ -126,6 +161,50 @@ def build_model(optimizer_name, **kwargs):
     return model, optimizer
 
 
+def load_scripted_model(state_dict_path, device, calibration_loader=None):
+    """
+    Loads the trained classifier and compiles it to TorchScript for inference
+    Without calibration data only the fully connected layers get int8 weights (fc1 holds almost all parameters)
+    With calibration data the whole network, convolutions included, is statically quantized to int8
+
+    :param state_dict_path: type: str
+    Path of the trained state dict (.pth)
+
+    :param device: type: str
+    Device to load the model onto
+
+    :param calibration_loader: type: torch.utils.data.DataLoader
+    Optional batches of (digits, labels) to record the activation ranges on
+
+    :return: type: torch.jit.ScriptModule
+    Scripted model in eval mode, not frozen so it can still be saved and loaded
+    """
+    model = MNISTClassifier().to(device)
+    state_dict = torch.load(state_dict_path, map_location=device)
+    model.load_state_dict(state_dict)
+    model.eval()
+
+    if calibration_loader is None:
+        model = torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    else:
+        # Fuse each layer with its ReLU, insert observers, run the calibration digits through,
+        # then swap in the int8 fbgemm kernels
+        model = torch.ao.quantization.fuse_modules(
+            model, [["conv1", "relu1"], ["conv2", "relu2"], ["fc1", "relu3"]])
+        model.qconfig = torch.ao.quantization.get_default_qconfig("fbgemm")
+        torch.ao.quantization.prepare(model, inplace=True)
+        with torch.no_grad():
+            for data, _ in calibration_loader:
+                model(data.to(device))
+        torch.ao.quantization.convert(model, inplace=True)
+
+    try:
+        return torch.jit.script(model)
+    except Exception:
+        # Scripting needs TorchScript compatible python, tracing only records one run
+        return torch.jit.trace(model, torch.zeros(1, 1, 28, 28, device=device))
+
+
 def get_custom_test_dataset_loader(dataset_path, train, batch_size):
     # train = true = 80% split
     # train = false = 20% split
@@ -135,13 +214,13 @@ def get_custom_test_dataset_loader(dataset_path, train, batch_size):
         digit_inv = cv2.adaptiveThreshold(img_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 27, 11)
         denoised_digit = sudoku_cells_reduce_noise(digit_inv)
         if denoised_digit is not None:
-            return Image.fromarray(denoised_digit)
+            # Normalized [1,28,28] tensor straight from the numpy digit, no PIL image in between
+            return digits_to_batch(denoised_digit[None])[0]
         raise RuntimeError("Bad data")
 
     test_dataset = ImageFolder(
         root=dataset_path,
         loader=loader,
-        transform=get_mnist_transform(),
     )
 
     # Calculate train test split if needed
@@ -2,9 +2,8 @@ from digits_classifier import sudoku_cells_reduce_noise
 from sklearn.metrics import confusion_matrix, accuracy_score
 import os
 import cv2
-from helper_functions_pt import MNISTClassifier, get_mnist_transform
+from helper_functions_pt import MNISTClassifier, digits_to_batch
 import torch
-from PIL import Image
 
 
 # Load trained model
@@ -39,11 +38,8 @@ for file in os.listdir(test_directory):
             denoised_digit = sudoku_cells_reduce_noise(digit_inv)
 
             if denoised_digit is not None:
-                digit = Image.fromarray(denoised_digit)
-                # Reshape to fit model input, [1,28,28]
-                digit_tensor = get_mnist_transform()(digit)
-                # Add batch dim, send to device
-                digit_tensor = digit_tensor.unsqueeze(0).to(device)
+                # Reshape to fit model input with a batch dim, [1,1,28,28], send to device
+                digit_tensor = digits_to_batch(denoised_digit[None]).to(device)
 
                 # Make prediction
                 with torch.no_grad():
@@ -10,6 +10,12 @@ from imutils import contours
 import itertools
 
 
+# Grid line index of the 4 corners of each cell inside a main cell, per cell column/row
+# Corner order: top left, top right, bottom right, bottom left
+_CELL_CORNER_COLS = np.array([[col, col + 1, col + 1, col] for col in range(3)])
+_CELL_CORNER_ROWS = np.array([[row, row, row + 1, row + 1] for row in range(3)])
+
+
 def get_grid_dimensions(image):
     """
     Tries to locate the grid dimension from a raw image
@@ -195,6 +201,31 @@ def sort_grid_contours(cnts):
     return grid_contours
 
 
+def sort_grid_cell_rects(cnts):
+    """
+    Same ordering as sort_grid_contours, but constructs the 9x9 nested list out of the bounding boxes of the cells
+    The bounding boxes are the ones sort_contours computes for sorting, so no cell is measured again
+
+    :param cnts: type: list
+    List of contours detected
+
+    :return: type: list
+    9x9 nested list containing (x, y, width, height) of each cell
+    """
+
+    grid_rects = [[] for _ in range(0, 9)]
+
+    # Sort contours (From top to bottom and left to right)
+    cnts, _ = contours.sort_contours(cnts, method="top-to-bottom")
+
+    # Extract every row
+    for row_index, row in enumerate(range(0, 81, 9), start=0):
+        _, row_rects = contours.sort_contours(cnts[row:row + 9], method="left-to-right")
+        grid_rects[row_index].extend(row_rects)
+
+    return grid_rects
+
+
 def reduce_noise(grid):
     """
     Prepare the grid for contour detection
@@ -293,29 +324,23 @@ def reduce_noise(grid):
 
 
 def get_cells_from_9_main_cells(cnts):
-    # New cnts to store cleaned cnts
-    new_cnts = []
-
     # Main cells extracted, split main cells to 81 cells
-    # Get individual main cell height and width for splitting
-    for cnt in cnts:
-        # Get bounding box for each contour
-        x, y, width, height = cv2.boundingRect(cnt)
-
-        # Calculate individual cell height and width
-        cell_height = height // 3
-        cell_width = width // 3
-
-        # Split contour into 9 cells
-        for row_num in range(1, 4):
-            for col_num in range(1, 4):
-                new_cnt = np.array([[(x + (cell_width * (col_num - 1)), y + (cell_height * (row_num - 1))),
-                                     (x + (cell_width * col_num), y + (cell_height * (row_num - 1))),
-                                     (x + (cell_width * col_num), y + (cell_height * row_num)),
-                                     (x + (cell_width * (col_num - 1)), y + (cell_height * row_num))]], dtype=np.int32)
-                new_cnts.append(new_cnt)
-
-    return new_cnts
+    # Get bounding box for each contour, [9,4]
+    rects = np.array([cv2.boundingRect(cnt) for cnt in cnts], dtype=np.int32).reshape(-1, 4)
+    x, y, width, height = rects.T
+
+    # Calculate individual cell height and width, then the 4 split lines of every main cell, [9,4]
+    steps = np.arange(4, dtype=np.int32)
+    line_xs = x[:, None] + (width // 3)[:, None] * steps
+    line_ys = y[:, None] + (height // 3)[:, None] * steps
+
+    # Split every contour into 9 cells at once, [main cell, row, col, corner, (x, y)]
+    new_cnts = np.empty((len(rects), 3, 3, 4, 2), dtype=np.int32)
+    new_cnts[..., 0] = line_xs[:, _CELL_CORNER_COLS][:, None]
+    new_cnts[..., 1] = line_ys[:, _CELL_CORNER_ROWS][:, :, None]
+
+    # Same order and contour shape [1,4,2] as splitting cell by cell
+    return list(new_cnts.reshape(-1, 1, 4, 2))
 
 
 def is_blur(image, thresh=100):
@@ -4,65 +4,82 @@ class BacktrackingSolver(Solver):
 
     def __init__(self, board, mode="Default"):
         super().__init__(board, mode)
-        self.cache = {}  # Memoization cache
     
     def is_strategy_based(self):
         return False
     
     def solve(self):
         """Solve the Sudoku puzzle using backtracking with optimizations."""
-        self.board.update_candidates_backtracking()  # Initialize candidates
+        # Board.__init__ already built the candidates; placements below keep
+        # them in step incrementally
         return self._solve_board()
     
-    def _board_to_tuple(self):
-        """Convert board state to a hashable tuple."""
-        return tuple(tuple(row) for row in self.board.cells)
-
     def _find_most_constrained_cell(self):
         """Find the empty cell with the fewest possible candidates (MRV heuristic)."""
-        min_candidates = float('inf')
-        best_cell = None
+        board = self.board
+        candidates = board.candidates
+        min_candidates = 10
+        best_index = -1
+
+        # Filled cells have no candidates, so more zero masks than filled cells
+        # means an empty cell without candidates: dead end
+        if candidates.count(0) != board.filled_count:
+            cells = board.cells_flat
+            for index, mask in enumerate(candidates):
+                if not mask and cells[index] == 0:
+                    return divmod(index, 9)
+
+        for index, mask in enumerate(candidates):
+            if mask:
+                num_candidates = mask.bit_count()
+                if num_candidates < min_candidates:
+                    min_candidates = num_candidates
+                    best_index = index
+                    if num_candidates == 1:
+                        break  # Naked single, nothing can beat it
 
-        for row in range(9):
-            for col in range(9):
-                if self.board.cells[row][col] is None:
-                    num_candidates = len(self.board.candidates[row][col])
-                    if num_candidates < min_candidates:
-                        min_candidates = num_candidates
-                        best_cell = (row, col)
-        
-        return best_cell  # Returns (row, col) or None if board is full
+        if best_index < 0:
+            return None  # Board is full
+        return divmod(best_index, 9)  # Returns (row, col)
 
     def _solve_board(self):
         """Recursive helper function to solve the Sudoku board."""
-        board_key = self._board_to_tuple()
-        if board_key in self.cache:
-            return self.cache[board_key]
-
         # Select the most constrained cell first (MRV heuristic)
         cell = self._find_most_constrained_cell()
         if cell is None:
-            self.cache[board_key] = True  # Board solved
-            return True  
+            return True  # Board solved
 
         row, col = cell
+        board = self.board
+
+        # Snapshot the candidate and unit masks once; every try restores from it
+        saved_candidates = board.candidates[:]
+        saved_row_mask = board.row_mask[:]
+        saved_col_mask = board.col_mask[:]
+        saved_box_mask = board.box_mask[:]
+
+        # Try each possible number for this cell, lowest bit first. The mask
+        # already excludes every digit in the row, column and box, so each
+        # candidate is a legal placement without a check_placement call.
+        mask = saved_candidates[row * 9 + col]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
 
-        # Try each possible number for this cell
-        for num in sorted(self.board.candidates[row][col]):  # Sort for consistency
-            if self.board.check_placement(num, row, col):
-                self.board.cells[row][col] = num
-                
-                # Forward checking: Temporarily update candidates
-                saved_candidates = self.board.candidates.copy()
-                self.board.update_candidates_backtracking()
+            # Forward checking: only the peers of the placed cell change
+            board.cells[row][col] = bit.bit_length() - 1
+            board.update_candidates_on_insert(row, col)
 
-                if self._solve_board():
-                    self.cache[board_key] = True
-                    return True
-                
-                # Backtrack: Restore previous state
-                self.board.cells[row][col] = None
-                self.board.candidates = saved_candidates
+            if self._solve_board():
+                return True
+            
+            # Backtrack: Restore previous state
+            board.cells[row][col] = 0
+            board.filled_count -= 1
+            board.candidates[:] = saved_candidates
+            board.version += 1
+            board.row_mask[:] = saved_row_mask
+            board.col_mask[:] = saved_col_mask
+            board.box_mask[:] = saved_box_mask
 
-        self.cache[board_key] = False  # No valid number found, backtrack
-        return False  
+        return False  # No valid number found, backtrack
@@ -16,49 +16,78 @@ from strategies.simple_coloring import SimpleColoringStrategy
 from strategies.xyz_wing import XYZWingStrategy
 from strategies.rectangle_elimination import RectangleEliminationStrategy
 from strategies.bug import BUGStrategy
+from strategies.strategy import TYPE_VALUE
 
 class StrategicSolver(Solver):
+    # Order strategies from simplest to most complex
+    STRATEGY_CLASSES = (
+        SingleCandidateStrategy,        # Naked Singles
+        HiddenSinglesStrategy,          # Hidden Singles
+        PointingPairsStrategy,          # Pointing Pairs
+        BoxLineIntersectionStrategy,    # Box/Line Intersection
+        NakedPairsStrategy,             # Naked Pairs
+        HiddenPairsStrategy,            # Hidden Pairs
+        NakedTriplesStrategy,           # Naked Triples
+        HiddenTriplesStrategy,          # Hidden Triples
+        NakedQuadsStrategy,             # Naked Quads
+        HiddenQuadsStrategy,            # Hidden Quads
+        XWingStrategy,                  # X-Wing
+        SwordfishStrategy,              # Swordfish
+        YWingStrategy,                  # Y-Wing
+        SimpleColoringStrategy,         # Simple Coloring
+        XYZWingStrategy,                # XYZ-Wing
+        RectangleEliminationStrategy,   # Rectangle Elimination
+        BUGStrategy,                    # BUG+1
+    )
+
     def __init__(self, board, mode = "Default", logger=None):
         super().__init__(board, mode)
         self.logger = logger
-        # Order strategies from simplest to most complex
-        self.strategies = [
-            SingleCandidateStrategy(self.board),    # Naked Singles
-            HiddenSinglesStrategy(self.board),      # Hidden Singles
-            PointingPairsStrategy(self.board),      # Pointing Pairs
-            BoxLineIntersectionStrategy(self.board), # Box/Line Intersection
-            NakedPairsStrategy(self.board),         # Naked Pairs
-            HiddenPairsStrategy(self.board),        # Hidden Pairs
-            NakedTriplesStrategy(self.board),       # Naked Triples
-            HiddenTriplesStrategy(self.board),      # Hidden Triples
-            NakedQuadsStrategy(self.board),         # Naked Quads
-            HiddenQuadsStrategy(self.board),        # Hidden Quads
-            XWingStrategy(self.board),              # X-Wing
-            SwordfishStrategy(self.board),          # Swordfish
-            YWingStrategy(self.board),              # Y-Wing
-            SimpleColoringStrategy(self.board),     # Simple Coloring
-            XYZWingStrategy(self.board),            # XYZ-Wing
-            RectangleEliminationStrategy(self.board), # Rectangle Elimination
-            BUGStrategy(self.board)                 # BUG+1
-
-        ]
+        # Strategy instances are built on first use; easy puzzles never
+        # reach the advanced ones
+        self._strategy_cache = [None] * len(self.STRATEGY_CLASSES)
+        # Board version at which every strategy last came up empty; strategies
+        # only depend on the board, so a search at that version fails again
+        self._exhausted_version = -1
         # State storing variables
         self.current_strategy = None
         self.values_to_insert = []
         self.candidates_to_eliminate = []
         self.observers = []  # Keep for backward compatibility
+        # (observer, on_strategy_found, on_state_changed, on_strategy_applied),
+        # resolved once in add_observer; a missing callback is None
+        self._observer_cbs = []
     
     def is_strategy_based(self):
         return True
 
+    def _get_strategy(self, index):
+        """Return the strategy at index in STRATEGY_CLASSES, creating it on first use."""
+        strategy = self._strategy_cache[index]
+        if strategy is None:
+            strategy = self._strategy_cache[index] = self.STRATEGY_CLASSES[index](self.board)
+        return strategy
+
+    @property
+    def strategies(self):
+        """All strategies in application order (instantiates any not yet used)."""
+        return [self._get_strategy(i) for i in range(len(self.STRATEGY_CLASSES))]
+
     def add_observer(self, observer):
         """Add an observer to track solving progress (kept for backward compatibility)."""
         self.observers.append(observer)
+        self._observer_cbs.append((
+            observer,
+            getattr(observer, 'on_strategy_found', None),
+            getattr(observer, 'on_state_changed', None),
+            getattr(observer, 'on_strategy_applied', None),
+        ))
     
     def remove_observer(self, observer):
         """Remove an observer from tracking (kept for backward compatibility)."""
         if observer in self.observers:
             self.observers.remove(observer)
+            self._observer_cbs = [cbs for cbs in self._observer_cbs if cbs[0] is not observer]
 
     def find_strategy(self):
         """
@@ -69,47 +98,49 @@ class StrategicSolver(Solver):
                    and the best strategy to apply.
         """
         self.current_strategy = None
-        strategy_found = False
+        logger = self.logger
+        # The testing / not found messages are verbose-only, so skip the calls otherwise
+        trace = logger and logger.verbose
+        observer_cbs = self._observer_cbs
+        # The state machine retries once before giving up; repeat the search
+        # only when verbose output has to show every strategy being tested
+        exhausted = self.board.version == self._exhausted_version and not trace
         
-        for strategy in self.strategies:
-            if self.logger:
-                self.logger.log_strategy_testing(strategy.name)
+        for index in range(0 if exhausted else len(self.STRATEGY_CLASSES)):
+            strategy = self._strategy_cache[index] or self._get_strategy(index)
+            if trace:
+                logger.log_strategy_testing(strategy.name)
                 
             result = strategy.process()
             if result:
                 self.current_strategy = strategy
                 
-                match (self.current_strategy.type):
-                    case "Value Finder":
-                        self.values_to_insert = result
-                    case "Candidate Eliminator":
-                        self.candidates_to_eliminate = result
-                    case _:
-                        pass
-                        
-                strategy_found = True
+                if strategy.type_id == TYPE_VALUE:
+                    self.values_to_insert = result
+                else:
+                    self.candidates_to_eliminate = result
                 
-                if self.logger:
-                    details = self.values_to_insert if self.current_strategy.type == "Value Finder" else self.candidates_to_eliminate
-                    self.logger.log_strategy_found(self.current_strategy.name, details)
+                if logger:
+                    logger.log_strategy_found(strategy.name, result)
                 
                 # Notify observers (for backward compatibility)
-                for observer in self.observers:
-                    if hasattr(observer, 'on_strategy_found'):
-                        observer.on_strategy_found(self.current_strategy.name)
+                for _, on_strategy_found, _, _ in observer_cbs:
+                    if on_strategy_found:
+                        on_strategy_found(strategy.name)
                         
-                break
-            else:
-                if self.logger:
-                    self.logger.log_strategy_not_found(strategy.name)
+                return (True, strategy.name)
+
+            if trace:
+                logger.log_strategy_not_found(strategy.name)
+
+        self._exhausted_version = self.board.version
  
-        if not strategy_found:
-            # Notify observers of state change (for backward compatibility)
-            for observer in self.observers:
-                if hasattr(observer, 'on_state_changed'):
-                    observer.on_state_changed("unsolvable", self.board)
+        # Notify observers of state change (for backward compatibility)
+        for _, _, on_state_changed, _ in observer_cbs:
+            if on_state_changed:
+                on_state_changed("unsolvable", self.board)
         
-        return (strategy_found, self.current_strategy.name if strategy_found else "None")
+        return (False, "None")
     
     def apply_strategy(self):
         """
@@ -120,57 +151,68 @@ class StrategicSolver(Solver):
         """
         updates = []
         update_type = None
+        strategy = self.current_strategy
         
-        if self.current_strategy:
-            if self.candidates_to_eliminate:
-                update_type = "elimination"
-                for row, col, candidate in self.candidates_to_eliminate:
-                    if candidate in self.board.candidates[row][col]:
-                        self.board.candidates[row][col].remove(candidate)
-                updates = self.candidates_to_eliminate
-                self.candidates_to_eliminate = []
-                
-            elif self.values_to_insert:
+        if strategy:
+            board = self.board
+            observer_cbs = self._observer_cbs
+
+            if strategy.type_id == TYPE_VALUE:
                 update_type = "insertion"
+                cells = board.cells
+                update_candidates_on_insert = board.update_candidates_on_insert
                 for row, col, num in self.values_to_insert:
-                    self.board.cells[row][col] = num
-                    self.board.update_candidates_on_insert(row, col)
+                    cells[row][col] = num
+                    update_candidates_on_insert(row, col)
                 updates = self.values_to_insert
                 self.values_to_insert = []
+            else:
+                update_type = "elimination"
+                remove_candidate = board.remove_candidate
+                for row, col, candidate in self.candidates_to_eliminate:
+                    remove_candidate(row, col, candidate)
+                updates = self.candidates_to_eliminate
+                self.candidates_to_eliminate = []
             
             # Store update_type for the state machine to use
             self.last_update_type = update_type
             
-            # Notify observers (for backward compatibility)
-            for observer in self.observers:
-                if hasattr(observer, 'on_strategy_applied'):
-                    observer.on_strategy_applied(self.current_strategy.name, updates)
-            
-            # Check if puzzle is solved
-            if self.board.is_solved():
-                # Notify observers of state change (for backward compatibility)
-                for observer in self.observers:
-                    if hasattr(observer, 'on_state_changed'):
-                        observer.on_state_changed("solved", self.board)
-            elif not self.board.is_valid():
+            # Notify observers (for backward compatibility); the solved and
+            # validity checks below only feed them, so skip it all without any
+            if observer_cbs:
+                for _, _, _, on_strategy_applied in observer_cbs:
+                    if on_strategy_applied:
+                        on_strategy_applied(strategy.name, updates)
+                
+                # Check if puzzle is solved; only a full board can be, so the unit
+                # scan runs once instead of after every step. Strategies keep the
+                # board consistent, so the validity scan is a Verbose-mode check.
+                state = None
+                if board.filled_count == 81 and board.is_solved():
+                    state = "solved"
+                elif self.mode == "Verbose" and not board.is_valid():
+                    state = "invalid"
+                
                 # Notify observers of state change (for backward compatibility)
-                for observer in self.observers:
-                    if hasattr(observer, 'on_state_changed'):
-                        observer.on_state_changed("invalid", self.board)
+                if state:
+                    for _, _, on_state_changed, _ in observer_cbs:
+                        if on_state_changed:
+                            on_state_changed(state, board)
         
         return updates
             
     def _eliminate_candidates(self):
         """Eliminates candidates from cells based on the current strategy's findings."""
+        remove_candidate = self.board.remove_candidate
         for row, col, candidate in self.candidates_to_eliminate:
-            if candidate in self.board.candidates[row][col]:
-                self.board.candidates[row][col].remove(candidate)
+            remove_candidate(row, col, candidate)
     
     def _insert_values(self):
         """Inserts values into cells based on the current strategy's findings."""
-        for value in self.values_to_insert:
-            row, col, num = value
-            self.board.cells[row][col] = num
-            self.board.update_candidates_on_insert(row, col)
+        board = self.board
+        cells = board.cells
+        for row, col, num in self.values_to_insert:
+            cells[row][col] = num
+            board.update_candidates_on_insert(row, col)
 
     
@@ -0,0 +1,121 @@
+"""
+Board analysis shared by the strategies.
+
+Several strategies derive the same data from one board state: the unit
+states of the subset strategies, the per-unit single-cell digits, and so on.
+A StrategyContext holds that data for one board version. Each piece is built
+on first use, and the whole context is replaced once board.version moves on.
+"""
+import weakref
+from typing import List, Tuple
+from board.board import Board, SET_BITS, unit_single_digits
+from strategies._units import UNIT_CELLS, UNIT_INDICES
+from strategies._kernels import candidate_locations
+
+
+class StrategyContext:
+    """Lazily built analysis of one board version, shared by all strategies."""
+
+    # Board -> its current context
+    _contexts = weakref.WeakKeyDictionary()
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+        self.version = board.version
+        self._empty_mask = None
+        self._unit_empty = [None] * 27
+        self._empty_cells = [None] * 27
+        self._unit_states = [None] * 27
+        self._unit_singles = None
+        self._unit_positions = None
+
+    @classmethod
+    def get(cls, board: Board) -> "StrategyContext":
+        """Return the context of the board's current version, creating it if needed."""
+        context = cls._contexts.get(board)
+        if context is None or context.version != board.version:
+            context = cls._contexts[board] = cls(board)
+        return context
+
+    @property
+    def empty_mask(self) -> int:
+        """81-bit mask of the empty cells, bit row * 9 + col standing for (row, col)."""
+        if self._empty_mask is None:
+            mask = 0
+            for index, value in enumerate(self.board.cells_flat):
+                if value == 0:
+                    mask |= 1 << index
+            self._empty_mask = mask
+        return self._empty_mask
+
+    def unit_empty(self, unit_id: int) -> int:
+        """Get the 9-bit mask of a unit's empty cells, bit i standing for UNIT_CELLS[unit_id][i]."""
+        mask = self._unit_empty[unit_id]
+        if mask is None:
+            cells_flat = self.board.cells_flat
+            mask = 0
+            for i, index in enumerate(UNIT_INDICES[unit_id]):
+                if cells_flat[index] == 0:
+                    mask |= 1 << i
+            self._unit_empty[unit_id] = mask
+        return mask
+
+    def empty_cells(self, unit_id: int) -> List[Tuple[int, int]]:
+        """
+        Get the empty cells of a unit. Callers must not modify the returned list.
+        
+        Args:
+            unit_id (int): Id of the unit (0-26)
+            
+        Returns:
+            List[Tuple[int, int]]: List of (row, col) tuples representing empty cells
+        """
+        cells = self._empty_cells[unit_id]
+        if cells is None:
+            unit = UNIT_CELLS[unit_id]
+            cells = self._empty_cells[unit_id] = [unit[i] for i in SET_BITS[self.unit_empty(unit_id)]]
+        return cells
+
+    def unit_state(self, unit_id: int) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+        """
+        Get the empty cells of a unit together with their candidate bitmasks and
+        the cell mask of every candidate. Callers must not modify the returned lists.
+        
+        Args:
+            unit_id (int): Id of the unit (0-26)
+            
+        Returns:
+            Tuple[List[Tuple[int, int]], List[int], List[int]]: The empty cells, their
+            candidate bitmasks and the candidate_locations of those bitmasks
+        """
+        state = self._unit_states[unit_id]
+        if state is None:
+            candidates = self.board.candidates
+            indices = UNIT_INDICES[unit_id]
+            empty_cells = self.empty_cells(unit_id)
+            cell_candidates = [candidates[indices[i]] for i in SET_BITS[self.unit_empty(unit_id)]]
+            state = (empty_cells, cell_candidates, candidate_locations(cell_candidates))
+            self._unit_states[unit_id] = state
+        return state
+
+    @property
+    def unit_singles(self) -> List[int]:
+        """Per unit id, the mask of digits left in exactly one of its cells."""
+        if self._unit_singles is None:
+            self._unit_singles = unit_single_digits(self.board.candidates)
+        return self._unit_singles
+
+    @property
+    def unit_positions(self) -> List[List[int]]:
+        """
+        Per candidate and unit id, the 9-bit mask of the unit's cells holding that
+        candidate, bit i standing for UNIT_CELLS[unit_id][i].
+        
+        Row masks are therefore indexed by column, column masks by row and box
+        masks by the cell's offset inside the box. The board keeps the table up
+        to date across eliminations and inserts instead of it being rebuilt for
+        every version.
+        """
+        if self._unit_positions is None:
+            self._unit_positions = self.board.get_unit_positions()
+        return self._unit_positions
@@ -0,0 +1,301 @@
+"""
+Bitmask kernels for the subset, fish and wing strategies.
+
+They only take and return plain ints (candidate masks in, masks out) and never
+touch the Board, so the strategies hand them one unit's masks (or the whole
+grid's, for the wings) and map the result back to cells themselves. This also keeps them free to be swapped for
+compiled versions.
+"""
+from itertools import combinations
+from board._kernels import ALL_CANDIDATES, PEERS, PEER_MASKS, SET_BITS
+
+
+def candidate_locations(cell_candidates):
+    """
+    Map each candidate to a bitmask of the cells it appears in.
+    
+    Args:
+        cell_candidates (List[int]): Candidate bitmasks of the unit's empty cells
+        
+    Returns:
+        List[int]: Ten masks indexed by candidate, bit i set when cell_candidates[i]
+        holds the candidate (index 0 stays empty)
+    """
+    locations = [0] * 10
+    for i, mask in enumerate(cell_candidates):
+        for candidate in SET_BITS[mask]:
+            locations[candidate] |= 1 << i
+    return locations
+
+
+def find_hidden_pair(cell_candidates, locations):
+    """
+    Find the first hidden pair within one unit.
+    
+    Candidates in exactly two cells are grouped by their cell mask, so two
+    candidates sharing the same two cells meet in one entry without a pairwise
+    scan. Groups are visited in order of their lowest candidate, which is the
+    order find_hidden_subset(..., 2) would report them in.
+    
+    Args:
+        cell_candidates (List[int]): Candidate bitmasks of the unit's empty cells
+        locations (List[int]): Their candidate_locations
+        
+    Returns:
+        Optional[Tuple[int, int]]: (digits, cells) bitmasks as in find_hidden_subset
+    """
+    cell_groups = {}
+    for candidate, cells in enumerate(locations):
+        if cells.bit_count() == 2:
+            cell_groups.setdefault(cells, []).append(candidate)
+    
+    for cells, group in cell_groups.items():
+        for first, second in combinations(group, 2):
+            digits = (1 << first) | (1 << second)
+            covered = 0
+            for i in SET_BITS[cells]:
+                covered |= cell_candidates[i]
+            if covered & ~digits:
+                return digits, cells
+    
+    return None
+
+
+def find_hidden_subset(cell_candidates, locations, size):
+    """
+    Find the first hidden subset of the given size within one unit.
+    
+    Args:
+        cell_candidates (List[int]): Candidate bitmasks of the unit's empty cells
+        locations (List[int]): Their candidate_locations
+        size (int): Number of candidates (and cells) in the subset
+        
+    Returns:
+        Optional[Tuple[int, int]]: (digits, cells) bitmasks of the first subset whose
+        cells hold other candidates to eliminate, bit i of cells standing for
+        cell_candidates[i]. None if no such subset exists.
+    """
+    # Only candidates in 2 to size cells can take part in a subset
+    potential = [
+        (1 << candidate, cells)
+        for candidate, cells in enumerate(locations)
+        if 2 <= cells.bit_count() <= size
+    ]
+    
+    def removes_something(digits, cells):
+        # The subset's cells must hold other candidates as well
+        covered = 0
+        for i in SET_BITS[cells]:
+            covered |= cell_candidates[i]
+        return bool(covered & ~digits)
+    
+    return _extend_subset(potential, _reach(potential), 0, size, size, 0, 0, removes_something)
+
+
+def find_naked_subset(cell_candidates, size):
+    """
+    Find the first naked subset of the given size within one unit.
+    
+    Args:
+        cell_candidates (List[int]): Candidate bitmasks of the unit's empty cells
+        size (int): Number of cells (and candidates) in the subset
+        
+    Returns:
+        Optional[Tuple[int, int]]: (digits, cells) bitmasks of the first subset whose
+        digits can be eliminated from other cells of the unit, bit i of cells
+        standing for cell_candidates[i]. None if no such subset exists.
+    """
+    # Only cells with 2 to size candidates can take part in a subset
+    potential = [
+        (1 << i, mask)
+        for i, mask in enumerate(cell_candidates)
+        if 2 <= mask.bit_count() <= size
+    ]
+    all_cells = (1 << len(cell_candidates)) - 1
+    
+    def removes_something(cells, digits):
+        # Some other cell of the unit must hold one of the subset's digits
+        for i in SET_BITS[all_cells & ~cells]:
+            if cell_candidates[i] & digits:
+                return True
+        return False
+    
+    found = _extend_subset(potential, _reach(potential), 0, size, size, 0, 0, removes_something)
+    return (found[1], found[0]) if found else None
+
+
+def find_x_wing(positions, line_offset, cross_offset, skip=0):
+    """
+    Find the first X-Wing over all candidates.
+    
+    Rows and columns are searched the same way, only the unit offsets of the
+    base lines and cross lines are swapped.
+    
+    Args:
+        positions (List[List[int]]): Per candidate and unit id, the mask of the
+            unit's cells holding the candidate (rows and columns at least)
+        line_offset (int): Unit id offset of the base lines
+        cross_offset (int): Unit id offset of the cross lines
+        skip (int): Candidate bitmask of candidates not to search
+        
+    Returns:
+        Optional[Tuple[int, int, int]]: (candidate, lines, cross) where lines and
+        cross are line-number masks: the first two base lines, in
+        itertools.combinations order, that hold the candidate exactly twice in
+        the same two cross lines and leave it somewhere else in those cross
+        lines. None if there is no such X-Wing.
+    """
+    base_lines = range(9)
+    for candidate in SET_BITS[ALL_CANDIDATES & ~skip]:
+        candidate_positions = positions[candidate]
+        
+        # Group the lines holding the candidate twice by those two cross lines,
+        # so only lines in the same group get paired up
+        lines_by_cross = {}
+        for line in base_lines:
+            cross = candidate_positions[line_offset + line]
+            if cross.bit_count() == 2:
+                lines_by_cross.setdefault(cross, []).append(line)
+        
+        # A group's first pair is its smallest; keep the smallest over all groups
+        best = None
+        for cross, lines in lines_by_cross.items():
+            if len(lines) < 2:
+                continue
+            cross1, cross2 = SET_BITS[cross]
+            cross_lines = candidate_positions[cross_offset + cross1] | candidate_positions[cross_offset + cross2]
+            for line1, line2 in combinations(lines, 2):
+                wing_lines = (1 << line1) | (1 << line2)
+                if cross_lines & ~wing_lines:
+                    if best is None or (line1, line2) < best[0]:
+                        best = ((line1, line2), wing_lines, cross)
+                    break
+        if best is not None:
+            return candidate, best[1], best[2]
+    
+    return None
+
+
+def find_swordfish(line_positions, cross_positions):
+    """
+    Find the first Swordfish of one candidate.
+    
+    Args:
+        line_positions (List[int]): Per base line, the mask of cross lines holding the candidate
+        cross_positions (List[int]): Per cross line, the mask of base lines holding it
+        
+    Returns:
+        Optional[Tuple[int, int]]: (lines, cross) masks of the first three base
+        lines, in itertools.combinations order, that hold the candidate 2 or 3
+        times within exactly three cross lines and leave it somewhere else in
+        those cross lines. None if there is no such Swordfish.
+    """
+    lines = [line for line in range(9) if 2 <= line_positions[line].bit_count() <= 3]
+    count = len(lines)
+    
+    # Grow the union one line at a time; a pair already spanning more than
+    # three cross lines rules out every third line
+    for i in range(count - 2):
+        cross1 = line_positions[lines[i]]
+        for j in range(i + 1, count - 1):
+            cross2 = cross1 | line_positions[lines[j]]
+            if cross2.bit_count() > 3:
+                continue
+            for k in range(j + 1, count):
+                cross = cross2 | line_positions[lines[k]]
+                if cross.bit_count() != 3:
+                    continue
+                fish_lines = (1 << lines[i]) | (1 << lines[j]) | (1 << lines[k])
+                for line in SET_BITS[cross]:
+                    if cross_positions[line] & ~fish_lines:
+                        return fish_lines, cross
+    
+    return None
+
+
+def find_xyz_wing(candidates):
+    """
+    Find the first XYZ-Wing that eliminates something.
+    
+    A pivot {X,Y,Z} with two bi-value peers drawn from its own candidates
+    ({X,Z} and {Y,Z}) forms an XYZ-Wing. The wings always cover the pivot and
+    share one candidate as long as their pairs differ, so that is the only
+    test left per pair of wings.
+    
+    Args:
+        candidates (List[int]): Candidate bitmasks of all 81 cells, row-major
+        
+    Returns:
+        Optional[Tuple[int, int]]: (candidate, cells) where cells is the 81-bit
+        mask of the cells seeing both wings that hold the wings' common
+        candidate, for the first pivot and wing pair in row-major order. None
+        if there is no such XYZ-Wing.
+    """
+    for pivot, pivot_cands in enumerate(candidates):
+        if pivot_cands.bit_count() != 3:
+            continue
+        wings = [index for index in PEERS[pivot]
+                 if candidates[index].bit_count() == 2 and not candidates[index] & ~pivot_cands]
+        for i in range(len(wings) - 1):
+            wing1 = wings[i]
+            cands1 = candidates[wing1]
+            for wing2 in wings[i + 1:]:
+                common = cands1 & candidates[wing2]
+                if common == cands1:
+                    continue
+                seen_by_both = PEER_MASKS[wing1] & PEER_MASKS[wing2]
+                cells = 0
+                while seen_by_both:
+                    low = seen_by_both & -seen_by_both
+                    seen_by_both ^= low
+                    if candidates[low.bit_length() - 1] & common:
+                        cells |= low
+                if cells:
+                    return common.bit_length() - 1, cells
+    
+    return None
+
+
+def _reach(potential):
+    """Returns reach, where reach[i] is the union of the masks of potential[i:]."""
+    reach = [0] * (len(potential) + 1)
+    for i in range(len(potential) - 1, -1, -1):
+        reach[i] = reach[i + 1] | potential[i][1]
+    return reach
+
+
+def _extend_subset(potential, reach, start, remaining, size, picked, union, removes_something):
+    """
+    Depth-first step of the subset searches.
+    
+    potential holds (bit, mask) items: a candidate and its cells for hidden
+    subsets, a cell and its candidates for naked ones. Adds one more of
+    potential[start:] to the partial subset (picked, union), in the same order
+    itertools.combinations would. A branch is dropped as soon as the running
+    union grows past size bits, and the rest of a level once the union with
+    everything left in reach can no longer reach size bits (reach only shrinks
+    further along, so nothing later can either).
+    
+    Returns the (picked, union) masks of the first complete subset whose union
+    has exactly size bits and for which removes_something(picked, union) holds.
+    """
+    for index in range(start, len(potential) - remaining + 1):
+        if (union | reach[index]).bit_count() < size:
+            break
+        
+        bit, mask = potential[index]
+        extended = union | mask
+        count = extended.bit_count()
+        if count > size:
+            continue
+        
+        if remaining > 1:
+            found = _extend_subset(potential, reach, index + 1, remaining - 1, size,
+                                   picked | bit, extended, removes_something)
+            if found:
+                return found
+        
+        elif count == size and removes_something(picked | bit, extended):
+            return picked | bit, extended
+    
+    return None
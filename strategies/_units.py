@@ -0,0 +1,29 @@
+"""
+Unit tables shared by the strategies.
+
+Units are numbered 0-8 for rows, 9-17 for columns and 18-26 for boxes, in the
+same order the strategies have always scanned them.
+"""
+from enum import IntEnum
+from board.board import ROW_CELLS, COL_CELLS, BOX_CELLS, CELL_UNIT_BITS
+
+# (row, col) coordinates of the nine cells of every unit id
+UNIT_CELLS = ROW_CELLS + COL_CELLS + BOX_CELLS
+
+# Flat indices (row * 9 + col) of the same cells
+UNIT_INDICES = tuple(tuple(row * 9 + col for row, col in unit) for unit in UNIT_CELLS)
+
+# CELL_UNIT_BITS: for every flat cell index, the (unit id, position bit) pair of
+# its row, column and box, the position bit being 1 << (the cell's offset within
+# UNIT_CELLS); defined with the board kernels, which keep positions up to date
+
+class UnitType(IntEnum):
+    """Unit types, valued at their first unit id so unit_type + index is the unit id."""
+    ROW = 0
+    COLUMN = 9
+    BOX = 18
+
+
+# First unit id of each unit type, by name
+UNIT_OFFSET = {'row': UnitType.ROW, 'column': UnitType.COLUMN, 'box': UnitType.BOX}
+
@@ -1,6 +1,96 @@
-from typing import List, Optional, Tuple, Dict, Set
+from typing import List, Optional, Tuple
 from .strategy import Strategy
-from board.board import Board
+from board.board import Board, BOX_CELLS
+
+
+def _line_of(positions: int, axis: int) -> int:
+    """Return the box row (axis 0) or column (axis 1) shared by all set positions, or -1."""
+    lines = {k // 3 if axis == 0 else k % 3 for k in range(9) if positions >> k & 1}
+    return lines.pop() if len(lines) == 1 else -1
+
+
+# 9-bit in-box position pattern -> the row/column (0-2) it lies on, or -1
+LINE_ROW = tuple(_line_of(positions, 0) for positions in range(512))
+LINE_COL = tuple(_line_of(positions, 1) for positions in range(512))
+
+# The digits, reused by the per-box finders rather than building a range each time
+DIGITS = range(1, 10)
+
+
+def _make_box_finder(box_index: int):
+    """
+    Build the box/line intersection finder specialised for one box.
+    
+    The box's flat cell indices and, for each of its 3 rows and 3 columns, the
+    (index, row, col) of the 6 line cells outside the box are baked into the
+    closure, so the finder does no box offset arithmetic or in-box skip tests.
+    
+    For each candidate, the box positions holding it are packed into a 9-bit
+    pattern (bit i*3+j for the cell i rows and j columns into the box), and
+    the LINE_ROW/LINE_COL tables say whether those positions share a line.
+    
+    Args:
+        box_index (int): Index of the box (0-8)
+        
+    Returns:
+        Callable taking the board's flat candidate masks and returning the list
+        of (row, col, value) eliminations for this box, or None.
+    """
+    box_row, box_col = BOX_CELLS[box_index][0]
+    box_indices = tuple(row * 9 + col for row, col in BOX_CELLS[box_index])
+    row_outside = tuple(
+        tuple(((box_row + i) * 9 + col, box_row + i, col)
+              for col in range(9) if not box_col <= col < box_col + 3)
+        for i in range(3))
+    col_outside = tuple(
+        tuple((row * 9 + box_col + j, row, box_col + j)
+              for row in range(9) if not box_row <= row < box_row + 3)
+        for j in range(3))
+
+    def find_box_line_intersections(candidates) -> Optional[List[Tuple[int, int, int]]]:
+        # In-box position pattern of every candidate, indexed by digit, built
+        # in one pass over the box cells
+        candidate_positions = [0] * 10
+        for k, index in enumerate(box_indices):
+            mask = candidates[index]
+            while mask:
+                bit = mask & -mask
+                candidate_positions[bit.bit_length() - 1] |= 1 << k
+                mask ^= bit
+        
+        eliminations = []
+        
+        # Check each candidate that appears in the box
+        for candidate in DIGITS:
+            positions = candidate_positions[candidate]
+            # Fewer than two cells: absent, or a single that the Single
+            # Candidate / Hidden Singles strategies place before this runs
+            if positions & (positions - 1) == 0:
+                continue
+            bit = 1 << candidate
+            
+            # If all occurrences are in the same row, eliminate from the rest of it
+            line = LINE_ROW[positions]
+            if line >= 0:
+                for index, row, col in row_outside[line]:
+                    if candidates[index] & bit:
+                        eliminations.append((row, col, candidate))
+            
+            # If all occurrences are in the same column, eliminate from the rest of it
+            line = LINE_COL[positions]
+            if line >= 0:
+                for index, row, col in col_outside[line]:
+                    if candidates[index] & bit:
+                        eliminations.append((row, col, candidate))
+        
+        return eliminations if eliminations else None
+
+    return find_box_line_intersections
+
+
+# One specialised finder per box, in box order
+_BOX_FINDERS = tuple(_make_box_finder(box_index) for box_index in range(9))
+
 
 class BoxLineIntersectionStrategy(Strategy):
     """
@@ -31,46 +121,6 @@ class BoxLineIntersectionStrategy(Strategy):
         """
         super().__init__(board, name="Box/Line Intersection Strategy", type="Candidate Eliminator")
         
-    def _get_cells_with_candidate_in_unit(self, unit_type: str, unit_index: int, candidate: int) -> List[Tuple[int, int]]:
-        """Get all cells in a unit (row/column) that contain a specific candidate."""
-        cells = []
-        
-        if unit_type == "row":
-            for col in range(9):
-                if self.board.cells[unit_index][col] is None and candidate in self.board.candidates[unit_index][col]:
-                    cells.append((unit_index, col))
-        else:  # column
-            for row in range(9):
-                if self.board.cells[row][unit_index] is None and candidate in self.board.candidates[row][unit_index]:
-                    cells.append((row, unit_index))
-                    
-        return cells
-    
-    def _cells_in_same_box(self, cells: List[Tuple[int, int]]) -> Tuple[bool, int]:
-        """Check if all cells are in the same box. Returns (True/False, box_index)."""
-        if not cells:
-            return False, -1
-            
-        boxes = {(row // 3) * 3 + (col // 3) for row, col in cells}
-        if len(boxes) == 1:
-            return True, next(iter(boxes))
-            
-        return False, -1
-    
-    def _eliminate_from_box(self, box: int, candidate: int, exclude_cells: Set[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
-        """Eliminate candidate from cells in the box except for the excluded cells."""
-        eliminations = []
-        box_row, box_col = (box // 3) * 3, (box % 3) * 3
-        
-        for i in range(3):
-            for j in range(3):
-                row, col = box_row + i, box_col + j
-                if (row, col) not in exclude_cells:
-                    if self.board.cells[row][col] is None and candidate in self.board.candidates[row][col]:
-                        eliminations.append((row, col, candidate))
-                            
-        return eliminations
-    
     def process(self) -> Optional[List[Tuple[int, int, int]]]:
         """
         Find box/line intersections in the grid.
@@ -80,73 +130,12 @@ class BoxLineIntersectionStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no box/line intersections are found.
         """
-        # Check each box (0-8)
-        for box_index in range(9):
-            # Get empty cells in this box
-            empty_cells = self._get_empty_cells_in_unit('box', box_index)
-            
-            # Skip if no empty cells
-            if not empty_cells:
-                continue
-            
-            # Find box/line intersections in this box
-            box_eliminations = self._find_box_line_intersections(box_index, empty_cells)
+        candidates = self.board.candidates
+        
+        # Check each box (0-8); a filled box has no candidates and yields nothing
+        for find_box_line_intersections in _BOX_FINDERS:
+            box_eliminations = find_box_line_intersections(candidates)
             if box_eliminations:
                 return box_eliminations  # Return as soon as we find useful eliminations
         
         return None
-    
-    def _find_box_line_intersections(self, box_index: int, empty_cells: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int, int]]]:
-        """
-        Find box/line intersections within a given box.
-        
-        Args:
-            box_index (int): Index of the box (0-8)
-            empty_cells (List[Tuple[int, int]]): List of empty cell coordinates in the box
-            
-        Returns:
-            Optional[List[Tuple[int, int, int]]]: List of eliminations if an intersection is found,
-            None otherwise.
-        """
-        box_row, box_col = (box_index // 3) * 3, (box_index % 3) * 3
-        
-        # Create a map of candidates to their locations in this box
-        candidate_locations: Dict[int, List[Tuple[int, int]]] = {i: [] for i in range(1, 10)}
-        for row, col in empty_cells:
-            for candidate in self.board.candidates[row][col]:
-                candidate_locations[candidate].append((row, col))
-        
-        eliminations = []
-        
-        # Check each candidate that appears in the box
-        for candidate, locations in candidate_locations.items():
-            if not locations:
-                continue
-            
-            # Check if all occurrences are in the same row
-            rows = {row for row, _ in locations}
-            if len(rows) == 1:
-                row = next(iter(rows))
-                # Look for the candidate in other cells in this row
-                for col in range(9):
-                    # Skip if cell is in the current box
-                    if box_col <= col < box_col + 3:
-                        continue
-                    if (self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]):
-                        eliminations.append((row, col, candidate))
-            
-            # Check if all occurrences are in the same column
-            cols = {col for _, col in locations}
-            if len(cols) == 1:
-                col = next(iter(cols))
-                # Look for the candidate in other cells in this column
-                for row in range(9):
-                    # Skip if cell is in the current box
-                    if box_row <= row < box_row + 3:
-                        continue
-                    if (self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]):
-                        eliminations.append((row, col, candidate))
-        
-        return eliminations if eliminations else None 
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import List, Optional, Tuple, Dict, Set
-from board.board import Board
+from typing import List, Optional, Tuple
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
+from strategies._units import UNIT_INDICES
 
 
 class HiddenSinglesStrategy(Strategy):
@@ -41,78 +42,54 @@ class HiddenSinglesStrategy(Strategy):
             value should be placed in the cell at (row, col). Returns None if no hidden
             singles are found.
         """
-        # Check each unit type (row, column, box)
-        for unit_type in ['row', 'column', 'box']:
-            # Check each unit index (0-8)
-            for unit_index in range(9):
-                # Get empty cells in this unit
-                empty_cells = self._get_empty_cells_in_unit(unit_type, unit_index)
-                
-                # Skip if no empty cells
-                if not empty_cells:
-                    continue
-                
-                # Find hidden singles in this unit
-                hidden_single = self._find_hidden_single_in_unit(empty_cells)
-                if hidden_single:
-                    return [hidden_single]  # Return as soon as we find a hidden single
+        candidates = self.board.candidates
         
-        return None
-
-    def _get_empty_cells_in_unit(self, unit_type, index):
-        """
-        Get all empty cells in a given unit (row, column, or box).
-        
-        Args:
-            unit_type (str): Type of unit ('row', 'column', or 'box')
-            index (int): Index of the unit (0-8)
+        # Check each unit (rows, then columns, then boxes)
+        for indices in UNIT_INDICES:
+            # Count all nine candidates of the unit at once: `once` collects the
+            # candidates seen so far and `twice` those seen again
+            once = twice = 0
+            for index in indices:
+                mask = candidates[index]
+                twice |= once & mask
+                once |= mask
+            singles = once & ~twice
             
-        Returns:
-            list: List of (row, col) tuples representing empty cells
-        """
-        empty_cells = []
-        if unit_type == 'row':
-            for col in range(9):
-                if self.board.cells[index][col] is None:
-                    empty_cells.append((index, col))
-        elif unit_type == 'column':
-            for row in range(9):
-                if self.board.cells[row][index] is None:
-                    empty_cells.append((row, index))
-        else:  # box
-            box_row, box_col = (index // 3) * 3, (index % 3) * 3
-            for i in range(3):
-                for j in range(3):
-                    row, col = box_row + i, box_col + j
-                    if self.board.cells[row][col] is None:
-                        empty_cells.append((row, col))
-        return empty_cells 
+            # Skip units where no candidate is left in a single cell
+            if not singles:
+                continue
+            
+            # Find hidden singles in this unit
+            hidden_single = self._find_hidden_single_in_unit(candidates, indices, singles)
+            if hidden_single:
+                return [hidden_single]  # Return as soon as we find a hidden single
+        
+        return None
 
-    def _find_hidden_single_in_unit(self, empty_cells: List[Tuple[int, int]]) -> Optional[Tuple[int, int, int]]:
+    def _find_hidden_single_in_unit(self, candidates, indices: Tuple[int, ...], singles: int) -> Optional[Tuple[int, int, int]]:
         """
-        Find a hidden single within a given unit's empty cells.
+        Find a hidden single within a given unit.
         
         Args:
-            empty_cells (List[Tuple[int, int]]): List of empty cell coordinates in the unit
+            candidates (array): The board's flat candidate bitmasks
+            indices (Tuple[int, ...]): Flat indices of the unit's cells
+            singles (int): Mask of the candidates left in exactly one cell of the unit
             
         Returns:
             Optional[Tuple[int, int, int]]: A tuple (row, col, value) if a hidden single is found,
             None otherwise.
         """
-        # Create a map of candidates to cells they appear in
-        candidate_locations: Dict[int, List[Tuple[int, int]]] = {i: [] for i in range(1, 10)}
-        for row, col in empty_cells:
-            for candidate in self.board.candidates[row][col]:
-                candidate_locations[candidate].append((row, col))
-        
-        # Check each candidate
-        for candidate, locations in candidate_locations.items():
-            # If a candidate appears in exactly one cell
-            if len(locations) == 1:
-                row, col = locations[0]
-                # Only return if this cell has multiple candidates
-                # (otherwise it would be a naked single)
-                if len(self.board.candidates[row][col]) > 1:
-                    return (row, col, candidate)
+        # Check each candidate that appears in exactly one cell
+        for candidate in SET_BITS[singles]:
+            bit = 1 << candidate
+            for index in indices:
+                cell_candidates = candidates[index]
+                if cell_candidates & bit:
+                    break
+            # Only return if this cell has multiple candidates
+            # (otherwise it would be a naked single)
+            if cell_candidates.bit_count() > 1:
+                row, col = divmod(index, 9)
+                return (row, col, candidate)
         
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,99 @@
+from typing import List, Optional, Sequence, Tuple
+from board.board import Board, SET_BITS
+from strategies.strategy import Strategy
+from strategies._context import StrategyContext
+from strategies._kernels import find_hidden_pair, find_hidden_subset
+
+
+def find_hidden_tuples(board: Board, sizes: Sequence[int] = (2, 3, 4),
+                       misses: Optional[List[Optional[tuple]]] = None) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    Find the first hidden pair, triple or quad on the board.
+    
+    Every unit is visited once and its candidate locations come from the shared
+    StrategyContext; the requested subset sizes are then tried on that unit in
+    the given order.
+    
+    Args:
+        board (Board): The Sudoku board to analyze
+        sizes (Sequence[int]): Subset sizes to look for, each from 2 to 4
+        misses (Optional[List[Optional[tuple]]]): Per unit id, the unit state of an
+            earlier call with the same sizes that found nothing there; such units
+            are skipped while unchanged, and misses is updated in place
+        
+    Returns:
+        Optional[List[Tuple[int, int, int]]]: List of (row, col, value) tuples where
+        value is a candidate that should be eliminated from the cell at (row, col).
+        Returns None if no hidden subset is found.
+    """
+    context = StrategyContext.get(board)
+    
+    # Check each unit (rows, then columns, then boxes)
+    for unit_id in range(27):
+        empty_cells, cell_candidates, locations = context.unit_state(unit_id)
+        state = (empty_cells, cell_candidates)
+        if misses is not None and misses[unit_id] == state:
+            continue
+        
+        for size in sizes:
+            # Skip if the unit has fewer empty cells than the subset needs
+            if len(empty_cells) < size:
+                continue
+            
+            if size == 2:
+                subset = find_hidden_pair(cell_candidates, locations)
+            else:
+                subset = find_hidden_subset(cell_candidates, locations, size)
+            if subset is None:
+                continue
+            
+            # Eliminate all other candidates from the subset's cells
+            digits, cells = subset
+            eliminations = []
+            for i in SET_BITS[cells]:
+                row, col = empty_cells[i]
+                for candidate in SET_BITS[cell_candidates[i] & ~digits]:
+                    eliminations.append((row, col, candidate))
+            return eliminations  # Return as soon as we find a useful subset
+        
+        if misses is not None:
+            misses[unit_id] = state
+    
+    return None
+
+
+class HiddenTuplesStrategy(Strategy):
+    """
+    Hidden Tuples Strategy.
+    
+    Looks for hidden pairs, triples and quads in a single pass over the units.
+    N candidates that appear only in the same N cells of a unit must fill those
+    cells, so all other candidates can be eliminated from them.
+    
+    The Hidden Pairs, Triples and Quads strategies are this strategy limited to
+    one subset size each.
+    """
+
+    def __init__(self, board: Board, sizes: Sequence[int] = (2, 3, 4),
+                 name: str = "Hidden Tuples Strategy") -> None:
+        """
+        Initialize the Hidden Tuples Strategy.
+        
+        Args:
+            board (Board): The Sudoku board to analyze
+            sizes (Sequence[int]): Subset sizes to look for, tried in this order per unit
+            name (str): Name of the strategy
+        """
+        super().__init__(board, name=name, type="Candidate Eliminator")
+        self.sizes = tuple(sizes)
+    
+    def process(self) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Find hidden subsets of the configured sizes in rows, columns, and boxes.
+        
+        Returns:
+            Optional[List[Tuple[int, int, int]]]: List of (row, col, value) tuples where
+            value is a candidate that should be eliminated from the cell at (row, col).
+            Returns None if no hidden subsets are found.
+        """
+        return find_hidden_tuples(self.board, self.sizes, self._unit_misses)
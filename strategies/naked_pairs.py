@@ -1,6 +1,5 @@
-from typing import List, Optional, Tuple, Dict, Set, FrozenSet
-from itertools import combinations
-from board.board import Board
+from typing import List, Optional, Tuple
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
 
 class NakedPairsStrategy(Strategy):
@@ -41,84 +40,60 @@ class NakedPairsStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no naked pairs are found.
         """
-        # Check each unit type (row, column, box)
-        for unit_type in ['row', 'column', 'box']:
-            # Check each unit index (0-8)
-            for unit_index in range(9):
-                # Get empty cells in this unit
-                empty_cells = self._get_empty_cells_in_unit(unit_type, unit_index)
-                
-                # Skip if less than 2 empty cells
-                if len(empty_cells) < 2:
-                    continue
-                
-                # Find naked pairs in this unit
-                unit_eliminations = self._find_naked_pairs_in_unit(empty_cells)
-                if unit_eliminations:
-                    return unit_eliminations  # Return as soon as we find a useful pair
+        context = self.context
+        
+        # Check each unit (rows, then columns, then boxes)
+        for unit_id in range(27):
+            # Get empty cells in this unit
+            empty_cells, cell_candidates, _ = context.unit_state(unit_id)
+            
+            # Skip if less than 2 empty cells
+            if len(empty_cells) < 2:
+                continue
+            
+            # Find naked pairs in this unit
+            unit_eliminations = self._find_naked_pairs_in_unit(empty_cells, cell_candidates)
+            if unit_eliminations:
+                return unit_eliminations  # Return as soon as we find a useful pair
         
         return None
     
-    def _find_naked_pairs_in_unit(self, empty_cells: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int, int]]]:
+    def _find_naked_pairs_in_unit(self, empty_cells: List[Tuple[int, int]],
+                                  cell_candidates: List[int]) -> Optional[List[Tuple[int, int, int]]]:
         """
         Find naked pairs within a given unit's empty cells.
         
         Args:
             empty_cells (List[Tuple[int, int]]): List of empty cell coordinates in the unit
+            cell_candidates (List[int]): Candidate bitmasks of those cells
             
         Returns:
             Optional[List[Tuple[int, int, int]]]: List of eliminations if a naked pair is found,
             None otherwise.
         """
-        # Find cells with exactly two candidates
-        pair_cells = [
-            (row, col, frozenset(self.board.candidates[row][col]))
-            for row, col in empty_cells
-            if len(self.board.candidates[row][col]) == 2
-        ]
+        # Find cells with exactly two candidates (as indices into empty_cells)
+        pair_cells = [i for i, mask in enumerate(cell_candidates) if mask.bit_count() == 2]
+        all_cells = (1 << len(empty_cells)) - 1
         
         # Check all possible combinations of two cells
-        for (row1, col1, cands1), (row2, col2, cands2) in combinations(pair_cells, 2):
-            # If these cells have the same candidates
-            if cands1 == cands2:
+        count = len(pair_cells)
+        for a in range(count):
+            i1 = pair_cells[a]
+            pair = cell_candidates[i1]
+            for b in range(a + 1, count):
+                i2 = pair_cells[b]
+                # Skip unless these cells have the same candidates
+                if pair != cell_candidates[i2]:
+                    continue
+                
                 # Try to eliminate these candidates from other cells in the unit
                 eliminations = []
-                for row, col in empty_cells:
-                    if (row, col) not in [(row1, col1), (row2, col2)]:
-                        for candidate in cands1:
-                            if candidate in self.board.candidates[row][col]:
-                                eliminations.append((row, col, candidate))
+                for i in SET_BITS[all_cells & ~((1 << i1) | (1 << i2))]:
+                    row, col = empty_cells[i]
+                    for candidate in SET_BITS[cell_candidates[i] & pair]:
+                        eliminations.append((row, col, candidate))
                 
                 if eliminations:
                     return eliminations
         
         return None
-
-    def _get_empty_cells_in_unit(self, unit_type, index):
-        """
-        Get all empty cells in a given unit (row, column, or box).
-        
-        Args:
-            unit_type (str): Type of unit ('row', 'column', or 'box')
-            index (int): Index of the unit (0-8)
-            
-        Returns:
-            list: List of (row, col) tuples representing empty cells
-        """
-        empty_cells = []
-        if unit_type == 'row':
-            for col in range(9):
-                if self.board.cells[index][col] is None:
-                    empty_cells.append((index, col))
-        elif unit_type == 'column':
-            for row in range(9):
-                if self.board.cells[row][index] is None:
-                    empty_cells.append((row, index))
-        else:  # box
-            box_row, box_col = (index // 3) * 3, (index % 3) * 3
-            for i in range(3):
-                for j in range(3):
-                    row, col = box_row + i, box_col + j
-                    if self.board.cells[row][col] is None:
-                        empty_cells.append((row, col))
-        return empty_cells 
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import List, Optional, Tuple, Dict, Set, FrozenSet
-from itertools import combinations
-from board.board import Board
+from typing import List, Optional, Tuple
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
+from strategies._kernels import find_naked_subset
 
 class NakedQuadsStrategy(Strategy):
     """
@@ -46,87 +46,55 @@ class NakedQuadsStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no naked quads are found.
         """
-        # Check each unit type (row, column, box)
-        for unit_type in ['row', 'column', 'box']:
-            # Check each unit index (0-8)
-            for unit_index in range(9):
-                # Get empty cells in this unit
-                empty_cells = self._get_empty_cells_in_unit(unit_type, unit_index)
-                
-                # Skip if less than 4 empty cells
-                if len(empty_cells) < 4:
-                    continue
-                
-                # Find naked quads in this unit
-                unit_eliminations = self._find_naked_quads_in_unit(empty_cells)
-                if unit_eliminations:
-                    return unit_eliminations  # Return as soon as we find a useful quad
+        context = self.context
+        
+        # Check each unit (rows, then columns, then boxes)
+        for unit_id in range(27):
+            # Get empty cells in this unit
+            empty_cells, cell_candidates, _ = context.unit_state(unit_id)
+            
+            # Skip if less than 4 empty cells
+            if len(empty_cells) < 4:
+                continue
+            
+            # Skip units unchanged since a search of them found nothing
+            state = (empty_cells, cell_candidates)
+            if self._unit_misses[unit_id] == state:
+                continue
+            
+            # Find naked quads in this unit
+            unit_eliminations = self._find_naked_quads_in_unit(empty_cells, cell_candidates)
+            if unit_eliminations:
+                return unit_eliminations  # Return as soon as we find a useful quad
+            self._unit_misses[unit_id] = state
         
         return None
     
-    def _find_naked_quads_in_unit(self, empty_cells: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int, int]]]:
+    def _find_naked_quads_in_unit(self, empty_cells: List[Tuple[int, int]],
+                                  cell_candidates: List[int]) -> Optional[List[Tuple[int, int, int]]]:
         """
         Find naked quads within a given unit's empty cells.
         
         Args:
             empty_cells (List[Tuple[int, int]]): List of empty cell coordinates in the unit
+            cell_candidates (List[int]): Candidate bitmask of each empty cell
             
         Returns:
             Optional[List[Tuple[int, int, int]]]: List of eliminations if a naked quad is found,
             None otherwise.
         """
-        # Find cells with two to four candidates
-        quad_cells = [
-            (row, col, frozenset(self.board.candidates[row][col]))
-            for row, col in empty_cells
-            if 2 <= len(self.board.candidates[row][col]) <= 4
-        ]
+        # Grow quads cell by cell, dropping any branch past four candidates
+        found = find_naked_subset(cell_candidates, 4)
+        if not found:
+            return None
         
-        # Check all possible combinations of four cells
-        for cells in combinations(quad_cells, 4):
-            # Get all unique candidates from these four cells
-            all_candidates = set().union(*(cands for _, _, cands in cells))
-            
-            # If these cells contain exactly four candidates total
-            if len(all_candidates) == 4:
-                # Try to eliminate these candidates from other cells in the unit
-                eliminations = []
-                for row, col in empty_cells:
-                    if not any((row, col) == (r, c) for r, c, _ in cells):
-                        for candidate in all_candidates:
-                            if candidate in self.board.candidates[row][col]:
-                                eliminations.append((row, col, candidate))
-                
-                if eliminations:
-                    return eliminations
+        # Eliminate the quad's candidates from the other cells in the unit
+        quad, quad_cells = found
+        other_cells = ((1 << len(empty_cells)) - 1) & ~quad_cells
+        eliminations = []
+        for i in SET_BITS[other_cells]:
+            row, col = empty_cells[i]
+            for candidate in SET_BITS[cell_candidates[i] & quad]:
+                eliminations.append((row, col, candidate))
         
-        return None
-
-    def _get_empty_cells_in_unit(self, unit_type, index):
-        """
-        Get all empty cells in a given unit (row, column, or box).
-        
-        Args:
-            unit_type (str): Type of unit ('row', 'column', or 'box')
-            index (int): Index of the unit (0-8)
-            
-        Returns:
-            list: List of (row, col) tuples representing empty cells
-        """
-        empty_cells = []
-        if unit_type == 'row':
-            for col in range(9):
-                if self.board.cells[index][col] is None:
-                    empty_cells.append((index, col))
-        elif unit_type == 'column':
-            for row in range(9):
-                if self.board.cells[row][index] is None:
-                    empty_cells.append((row, index))
-        else:  # box
-            box_row, box_col = (index // 3) * 3, (index % 3) * 3
-            for i in range(3):
-                for j in range(3):
-                    row, col = box_row + i, box_col + j
-                    if self.board.cells[row][col] is None:
-                        empty_cells.append((row, col))
-        return empty_cells 
\ No newline at end of file
+        return eliminations
@@ -1,6 +1,15 @@
 from typing import List, Optional, Tuple, Dict, Set
 from .strategy import Strategy
-from board.board import Board
+from ._units import UnitType
+from board.board import Board, SET_BITS
+
+# Per box, the columns and rows outside it, so the line scans need no
+# box offsets or in-box skip tests
+OUTSIDE_COLS = tuple(tuple(col for col in range(9) if col // 3 != box % 3) for box in range(9))
+OUTSIDE_ROWS = tuple(tuple(row for row in range(9) if row // 3 != box // 3) for box in range(9))
+
+# The digits, reused by the per-box loops rather than building a range each time
+DIGITS = range(1, 10)
 
 class PointingPairsStrategy(Strategy):
     """
@@ -41,10 +50,13 @@ class PointingPairsStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no pointing pairs are found.
         """
+        context = self.context
+        box_offset = int(UnitType.BOX)
+        
         # Check each box (0-8)
         for box_index in range(9):
             # Get empty cells in this box
-            empty_cells = self._get_empty_cells_in_unit('box', box_index)
+            empty_cells = context.empty_cells(box_offset + box_index)
             
             # Skip if less than 2 empty cells
             if len(empty_cells) < 2:
@@ -69,45 +81,44 @@ class PointingPairsStrategy(Strategy):
             Optional[List[Tuple[int, int, int]]]: List of eliminations if a pointing pair is found,
             None otherwise.
         """
-        box_row, box_col = (box_index // 3) * 3, (box_index % 3) * 3
-        
-        # Create a map of candidates to their locations in this box
-        candidate_locations: Dict[int, List[Tuple[int, int]]] = {i: [] for i in range(1, 10)}
+        # Per candidate, the number of box cells holding it and the masks of
+        # the rows and columns they lie in (index 0 stays empty)
+        candidate_counts = [0] * 10
+        candidate_rows = [0] * 10
+        candidate_cols = [0] * 10
+        candidates = self.board.candidates
         for row, col in empty_cells:
-            for candidate in self.board.candidates[row][col]:
-                candidate_locations[candidate].append((row, col))
+            row_bit = 1 << row
+            col_bit = 1 << col
+            for candidate in SET_BITS[candidates[row * 9 + col]]:
+                candidate_counts[candidate] += 1
+                candidate_rows[candidate] |= row_bit
+                candidate_cols[candidate] |= col_bit
         
         eliminations = []
         
         # Check each candidate that appears in 2 or 3 cells in the box
-        for candidate, locations in candidate_locations.items():
-            if len(locations) not in [2, 3]:
+        for candidate in DIGITS:
+            if not 2 <= candidate_counts[candidate] <= 3:
                 continue
+            bit = 1 << candidate
             
             # Check if all occurrences are in the same row
-            rows = {row for row, _ in locations}
-            if len(rows) == 1:
-                row = next(iter(rows))
+            rows = candidate_rows[candidate]
+            if rows.bit_count() == 1:
+                row = rows.bit_length() - 1
                 # Look for the candidate in other cells in this row
-                for col in range(9):
-                    # Skip if cell is in the current box
-                    if box_col <= col < box_col + 3:
-                        continue
-                    if (self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]):
+                for col in OUTSIDE_COLS[box_index]:
+                    if candidates[row * 9 + col] & bit:
                         eliminations.append((row, col, candidate))
             
             # Check if all occurrences are in the same column
-            cols = {col for _, col in locations}
-            if len(cols) == 1:
-                col = next(iter(cols))
+            cols = candidate_cols[candidate]
+            if cols.bit_count() == 1:
+                col = cols.bit_length() - 1
                 # Look for the candidate in other cells in this column
-                for row in range(9):
-                    # Skip if cell is in the current box
-                    if box_row <= row < box_row + 3:
-                        continue
-                    if (self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]):
+                for row in OUTSIDE_ROWS[box_index]:
+                    if candidates[row * 9 + col] & bit:
                         eliminations.append((row, col, candidate))
         
         return eliminations if eliminations else None 
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
+from collections import defaultdict
 from itertools import combinations
-from board.board import Board
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
 
 class RectangleEliminationStrategy(Strategy):
@@ -10,33 +11,37 @@ class RectangleEliminationStrategy(Strategy):
         super().__init__(board, name="Rectangle Elimination Strategy", type="Candidate Eliminator")
 
     def process(self) -> Optional[List[Tuple[int, int, int]]]:
-        for rows in combinations(range(9), 2):
-            for cols in combinations(range(9), 2):
-                cells = [
-                    (rows[0], cols[0]), (rows[0], cols[1]),
-                    (rows[1], cols[0]), (rows[1], cols[1])
-                ]
-                cand_sets = [
-                    self.board.candidates[r][c]
-                    for r, c in cells
-                    if self.board.cells[r][c] is None
-                ]
-                if len(cand_sets) < 4:
-                    continue
-
-                pair_cells = [s for s in cand_sets if len(s) == 2]
-                if len(pair_cells) != 3:
-                    continue
+        # Group the bi-value cells by their candidate pair
+        candidates = self.board.candidates
+        cells_by_pair: Dict[int, List[int]] = defaultdict(list)
+        for index, mask in enumerate(candidates):
+            if mask.bit_count() == 2:
+                cells_by_pair[mask].append(index)
 
-                if not all(pair_cells[0] == s for s in pair_cells[1:]):
+        # Three cells sharing a pair that span two rows and two columns fix the
+        # fourth corner; keep the first such rectangle in (rows, cols) order
+        best = None
+        for common, cells in cells_by_pair.items():
+            if len(cells) < 3:
+                continue
+            for corners in combinations(cells, 3):
+                i1, i2, i3 = corners
+                rows = (1 << i1 // 9) | (1 << i2 // 9) | (1 << i3 // 9)
+                cols = (1 << i1 % 9) | (1 << i2 % 9) | (1 << i3 % 9)
+                if rows.bit_count() != 2 or cols.bit_count() != 2:
                     continue
+                r1, r2 = SET_BITS[rows]
+                c1, c2 = SET_BITS[cols]
+                # The four corner indices add up to 18 * (r1 + r2) + 2 * (c1 + c2)
+                target = 18 * (r1 + r2) + 2 * (c1 + c2) - sum(corners)
+                target_mask = candidates[target]
+                if not common & ~target_mask and target_mask.bit_count() > 2:
+                    key = (r1, r2, c1, c2)
+                    if best is None or key < best[0]:
+                        best = (key, target, common)
 
-                common = pair_cells[0]
-                target_idx = next(i for i, s in enumerate(cand_sets) if s != common)
-                target = cells[target_idx]
-                target_set = self.board.candidates[target[0]][target[1]]
-
-                if common.issubset(target_set) and len(target_set) > 2:
-                    eliminations = [(target[0], target[1], val) for val in common]
-                    return eliminations
-        return None
+        if best is None:
+            return None
+        _, target, common = best
+        row, col = divmod(target, 9)
+        return [(row, col, val) for val in SET_BITS[common]]
@@ -1,18 +1,65 @@
 from typing import Dict, List, Optional, Set, Tuple
-from collections import defaultdict, deque
-from board.board import Board
+from collections import defaultdict
+from board.board import Board, PEER_MASKS, SET_BITS
 from strategies.strategy import Strategy
+from strategies._units import UNIT_CELLS
+
+# Unit ids in the order strong links are collected: rows and columns
+# interleaved, then boxes
+LINK_UNITS = tuple([unit for i in range(9) for unit in (i, 9 + i)] + list(range(18, 27)))
+
+class _ParityUnionFind:
+    """Union-find over flat cell indices that also tracks each cell's parity to its parent."""
+
+    def __init__(self) -> None:
+        # Only linked cells get entries; a cell without one is its own root
+        self.parent: Dict[int, Tuple[int, int]] = {}
+
+    def find(self, x: int) -> Tuple[int, int]:
+        """Return (root, parity of x relative to the root), compressing the path."""
+        parent = self.parent
+        path = []
+        parity = 0
+        while x in parent:
+            path.append(x)
+            x, step = parent[x]
+            parity ^= step
+        # Point every cell on the path straight at the root
+        running = parity
+        for cell in path:
+            step = parent[cell][1]
+            parent[cell] = (x, running)
+            running ^= step
+        return x, parity
+
+    def union(self, a: int, b: int) -> None:
+        """Join the sets of a and b, giving a and b opposite parities."""
+        root_a, parity_a = self.find(a)
+        root_b, parity_b = self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = (root_a, parity_a ^ parity_b ^ 1)
 
 class SimpleColoringStrategy(Strategy):
     """Simple Coloring technique for candidate elimination."""
 
     def __init__(self, board: Board) -> None:
         super().__init__(board, name="Simple Coloring Strategy", type="Candidate Eliminator")
+        # Per candidate, the (row position masks, components) of the last call;
+        # the graph only changes when the cells holding the candidate do
+        self._component_cache: List[Optional[Tuple[Tuple[int, ...], List[Dict[Tuple[int, int], bool]]]]] = [None] * 10
 
     def process(self) -> Optional[List[Tuple[int, int, int]]]:
+        unit_positions = self.context.unit_positions
         for candidate in range(1, 10):
-            links = self._find_strong_links(candidate)
-            components = self._color_components(links)
+            # The row masks pin down every cell holding the candidate
+            signature = tuple(unit_positions[candidate][:9])
+            cached = self._component_cache[candidate]
+            if cached is not None and cached[0] == signature:
+                components = cached[1]
+            else:
+                links = self._find_strong_links(candidate)
+                components = self._color_components(links)
+                self._component_cache[candidate] = (signature, components)
             for color_map in components:
                 eliminations = self._check_contradiction(candidate, color_map)
                 if eliminations:
@@ -21,76 +68,64 @@ class SimpleColoringStrategy(Strategy):
 
     def _find_strong_links(self, candidate: int) -> Dict[Tuple[int, int], Set[Tuple[int, int]]]:
         links: Dict[Tuple[int, int], Set[Tuple[int, int]]] = defaultdict(set)
+        # Cells of each unit holding the candidate, bit i for UNIT_CELLS[unit_id][i]
+        positions = self.context.unit_positions[candidate]
 
-        # Rows and columns
-        for i in range(9):
-            row_cells = [(i, c) for c in range(9)
-                         if self.board.cells[i][c] is None and candidate in self.board.candidates[i][c]]
-            if len(row_cells) == 2:
-                a, b = row_cells
+        # A unit with the candidate in exactly two cells links those cells
+        for unit_id in LINK_UNITS:
+            unit_positions = positions[unit_id]
+            if unit_positions.bit_count() == 2:
+                first, second = SET_BITS[unit_positions]
+                a = UNIT_CELLS[unit_id][first]
+                b = UNIT_CELLS[unit_id][second]
                 links[a].add(b)
                 links[b].add(a)
-
-            col_cells = [(r, i) for r in range(9)
-                         if self.board.cells[r][i] is None and candidate in self.board.candidates[r][i]]
-            if len(col_cells) == 2:
-                a, b = col_cells
-                links[a].add(b)
-                links[b].add(a)
-
-        # Boxes
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                box_cells = []
-                for r in range(br, br + 3):
-                    for c in range(bc, bc + 3):
-                        if self.board.cells[r][c] is None and candidate in self.board.candidates[r][c]:
-                            box_cells.append((r, c))
-                if len(box_cells) == 2:
-                    a, b = box_cells
-                    links[a].add(b)
-                    links[b].add(a)
         return links
 
     def _color_components(self, links: Dict[Tuple[int, int], Set[Tuple[int, int]]]) -> List[Dict[Tuple[int, int], bool]]:
-        visited: Set[Tuple[int, int]] = set()
-        components: List[Dict[Tuple[int, int], bool]] = []
+        # Join linked cells with opposite parity; a cell's color is then its
+        # parity to the root, read without walking the graph
+        uf = _ParityUnionFind()
+        for (r, c), neighbors in links.items():
+            a = r * 9 + c
+            for nr, nc in neighbors:
+                b = nr * 9 + nc
+                if a < b:  # each link is listed from both ends
+                    uf.union(a, b)
 
+        # Components in order of their first cell in links, which gets True
+        components: Dict[int, Tuple[int, Dict[Tuple[int, int], bool]]] = {}
         for cell in links:
-            if cell in visited:
-                continue
-            comp: Dict[Tuple[int, int], bool] = {}
-            queue = deque([(cell, True)])
-            while queue:
-                current, color = queue.popleft()
-                if current in comp:
-                    continue
-                comp[current] = color
-                visited.add(current)
-                for neighbor in links.get(current, set()):
-                    if neighbor not in comp:
-                        queue.append((neighbor, not color))
-            components.append(comp)
-        return components
+            root, parity = uf.find(cell[0] * 9 + cell[1])
+            entry = components.get(root)
+            if entry is None:
+                entry = components[root] = (parity, {})
+            entry[1][cell] = parity == entry[0]
+        return [comp for _, comp in components.values()]
 
     def _cells_share_unit(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
-        if a[0] == b[0] or a[1] == b[1]:
-            return True
-        return a[0] // 3 == b[0] // 3 and a[1] // 3 == b[1] // 3
+        return bool(PEER_MASKS[a[0] * 9 + a[1]] >> (b[0] * 9 + b[1]) & 1)
 
     def _check_contradiction(self, candidate: int, color_map: Dict[Tuple[int, int], bool]) -> Optional[List[Tuple[int, int, int]]]:
         for color in [True, False]:
-            cells = [cell for cell, col in color_map.items() if col == color]
-            for i in range(len(cells)):
-                for j in range(i + 1, len(cells)):
-                    if self._cells_share_unit(cells[i], cells[j]):
-                        # Contradiction found, eliminate candidate from opposite color
-                        elim_color = not color
-                        eliminations = []
-                        for cell, col in color_map.items():
-                            if col == elim_color:
-                                r, c = cell
-                                if candidate in self.board.candidates[r][c]:
-                                    eliminations.append((r, c, candidate))
-                        return eliminations if eliminations else None
+            # A cell of this color seeing an earlier one is a contradiction;
+            # OR-ing the peers of the cells so far tests all pairs in one pass
+            seen_peers = 0
+            for (r, c), col in color_map.items():
+                if col != color:
+                    continue
+                index = r * 9 + c
+                if seen_peers >> index & 1:
+                    # Contradiction found, eliminate candidate from opposite color
+                    elim_color = not color
+                    eliminations = []
+                    candidates = self.board.candidates
+                    bit = 1 << candidate
+                    for cell, col in color_map.items():
+                        if col == elim_color:
+                            r, c = cell
+                            if candidates[r * 9 + c] & bit:
+                                eliminations.append((r, c, candidate))
+                    return eliminations if eliminations else None
+                seen_peers |= PEER_MASKS[index]
         return None
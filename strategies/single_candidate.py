@@ -37,14 +37,12 @@ class SingleCandidateStrategy(Strategy):
         """
         values_to_insert = []
         
-        # Check each empty cell for single candidates
-        for row in range(9):
-            for col in range(9):
-                if self.board.cells[row][col] is None:
-                    candidates = self.board.candidates[row][col]
-                    if len(candidates) == 1:
-                        value = next(iter(candidates))
-                        values_to_insert.append((row, col, value))
+        # One pass over the flat candidate masks; filled cells hold 0 and a
+        # single-bit mask has nothing left once its lowest bit is cleared
+        for index, candidates in enumerate(self.board.candidates):
+            if candidates and not candidates & (candidates - 1):
+                row, col = divmod(index, 9)
+                values_to_insert.append((row, col, candidates.bit_length() - 1))
         
         return values_to_insert if values_to_insert else None
     
\ No newline at end of file
@@ -1,5 +1,11 @@
-from typing import List, Optional, Tuple, Set
+from typing import List, Optional, Tuple, Set, Union
 from board.board import Board
+from strategies._units import UNIT_OFFSET, UnitType
+from strategies._context import StrategyContext
+
+# Integer ids for the strategy types, so solvers can branch without string compares
+TYPE_VALUE = 0  # "Value Finder"
+TYPE_ELIM = 1   # "Candidate Eliminator"
 
 class Strategy:
     """
@@ -29,6 +35,11 @@ class Strategy:
         self.board = board
         self._name = name
         self._type = type
+        self.type_id = TYPE_VALUE if type == "Value Finder" else TYPE_ELIM
+        # Per unit id, the (empty cells, candidate masks) of the last search of
+        # that unit that found nothing; strategies working unit by unit skip a
+        # unit while its state still matches
+        self._unit_misses: List[Optional[tuple]] = [None] * 27
     
     @property
     def name(self) -> str:
@@ -52,27 +63,39 @@ class Strategy:
         """
         raise NotImplementedError("Strategy must implement the process method.")
     
-    def _get_empty_cells_in_unit(self, unit_type: str, index: int) -> List[Tuple[int, int]]:
+    @property
+    def context(self) -> StrategyContext:
+        """
+        The shared analysis of the board's current version.
+        
+        Every strategy asking within one board version gets the same context, so
+        whatever one of them builds (unit states, position masks, ...) is reused
+        by the others until the board changes.
+        """
+        return StrategyContext.get(self.board)
+    
+    def _empty_mask(self) -> int:
+        """
+        Get the empty cells of the board as one bitboard, built once per board version.
+        
+        Returns:
+            int: 81-bit mask where bit row * 9 + col is set if (row, col) is empty
+        """
+        return self.context.empty_mask
+    
+    def _get_empty_cells_in_unit(self, unit_type: Union[UnitType, str], index: int) -> List[Tuple[int, int]]:
         """
         Get all empty cells in a given unit (row, column, or box).
         
         Args:
-            unit_type (str): Type of unit ('row', 'column', or 'box')
+            unit_type (Union[UnitType, str]): Type of unit, a UnitType or its name
+                ('row', 'column', or 'box')
             index (int): Index of the unit (0-8)
             
         Returns:
             List[Tuple[int, int]]: List of (row, col) tuples representing empty cells
         """
-        empty_cells = []
-        if unit_type == 'row':
-            empty_cells = [(index, col) for col in range(9) if self.board.cells[index][col] is None]
-        elif unit_type == 'column':
-            empty_cells = [(row, index) for row in range(9) if self.board.cells[row][index] is None]
-        else:  # box
-            box_row, box_col = (index // 3) * 3, (index % 3) * 3
-            empty_cells = [(box_row + i, box_col + j) 
-                          for i in range(3) 
-                          for j in range(3) 
-                          if self.board.cells[box_row + i][box_col + j] is None]
-        return empty_cells
+        if unit_type.__class__ is str:
+            unit_type = UNIT_OFFSET[unit_type]
+        return self.context.empty_cells(unit_type + index)
     
\ No newline at end of file
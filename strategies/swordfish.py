@@ -1,7 +1,7 @@
 from typing import List, Optional, Tuple, Dict, Set
-from itertools import combinations
-from board.board import Board
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
+from strategies._kernels import find_swordfish
 
 class SwordfishStrategy(Strategy):
     """
@@ -67,46 +67,26 @@ class SwordfishStrategy(Strategy):
             Optional[List[Tuple[int, int, int]]]: List of eliminations if a Swordfish pattern is found,
             None otherwise.
         """
+        # Per candidate and unit, the cells holding it; a row's mask is indexed by column
+        positions = self.context.unit_positions
+        
         # For each candidate value
         for candidate in range(1, 10):
-            # Find rows where the candidate appears 2 or 3 times
-            rows_with_candidate = []
-            row_to_cols = {}  # Maps row index to columns where candidate appears
-            
-            for row in range(9):
-                # Find columns in this row where the candidate appears
-                cols = [col for col in range(9) if 
-                       self.board.cells[row][col] is None and 
-                       candidate in self.board.candidates[row][col]]
-                
-                # If candidate appears 2 or 3 times in this row
-                if len(cols) in [2, 3]:
-                    rows_with_candidate.append(row)
-                    row_to_cols[row] = cols
+            candidate_positions = positions[candidate]
             
-            # Check all combinations of three rows
-            for row1, row2, row3 in combinations(rows_with_candidate, 3):
-                # Get all columns where the candidate appears in these rows
-                all_cols = set(row_to_cols[row1] + row_to_cols[row2] + row_to_cols[row3])
+            # Find three rows holding the candidate 2 or 3 times, and within
+            # exactly three columns, that leave something to eliminate
+            found = find_swordfish(candidate_positions[:9], candidate_positions[9:18])
+            if found:
+                # We found a Swordfish pattern
+                swordfish_rows, all_cols = found
                 
-                # If the candidate appears in exactly three columns
-                if len(all_cols) == 3:
-                    # We found a Swordfish pattern
-                    cols = list(all_cols)
-                    
-                    # Find cells in these columns (excluding the Swordfish cells) where the candidate can be eliminated
-                    eliminations = []
-                    swordfish_rows = {row1, row2, row3}
-                    
-                    for col in cols:
-                        for row in range(9):
-                            if row not in swordfish_rows:
-                                if (self.board.cells[row][col] is None and 
-                                    candidate in self.board.candidates[row][col]):
-                                    eliminations.append((row, col, candidate))
-                    
-                    if eliminations:
-                        return eliminations
+                # Eliminate the candidate from other cells in these columns
+                eliminations = []
+                for col in SET_BITS[all_cols]:
+                    for row in SET_BITS[candidate_positions[9 + col] & ~swordfish_rows]:
+                        eliminations.append((row, col, candidate))
+                return eliminations
         
         return None
     
@@ -119,45 +99,25 @@ class SwordfishStrategy(Strategy):
             Optional[List[Tuple[int, int, int]]]: List of eliminations if a Swordfish pattern is found,
             None otherwise.
         """
+        # Per candidate and unit, the cells holding it; a column's mask is indexed by row
+        positions = self.context.unit_positions
+        
         # For each candidate value
         for candidate in range(1, 10):
-            # Find columns where the candidate appears 2 or 3 times
-            cols_with_candidate = []
-            col_to_rows = {}  # Maps column index to rows where candidate appears
+            candidate_positions = positions[candidate]
             
-            for col in range(9):
-                # Find rows in this column where the candidate appears
-                rows = [row for row in range(9) if 
-                       self.board.cells[row][col] is None and 
-                       candidate in self.board.candidates[row][col]]
+            # Find three columns holding the candidate 2 or 3 times, and within
+            # exactly three rows, that leave something to eliminate
+            found = find_swordfish(candidate_positions[9:18], candidate_positions[:9])
+            if found:
+                # We found a Swordfish pattern
+                swordfish_cols, all_rows = found
                 
-                # If candidate appears 2 or 3 times in this column
-                if len(rows) in [2, 3]:
-                    cols_with_candidate.append(col)
-                    col_to_rows[col] = rows
-            
-            # Check all combinations of three columns
-            for col1, col2, col3 in combinations(cols_with_candidate, 3):
-                # Get all rows where the candidate appears in these columns
-                all_rows = set(col_to_rows[col1] + col_to_rows[col2] + col_to_rows[col3])
-                
-                # If the candidate appears in exactly three rows
-                if len(all_rows) == 3:
-                    # We found a Swordfish pattern
-                    rows = list(all_rows)
-                    
-                    # Find cells in these rows (excluding the Swordfish cells) where the candidate can be eliminated
-                    eliminations = []
-                    swordfish_cols = {col1, col2, col3}
-                    
-                    for row in rows:
-                        for col in range(9):
-                            if col not in swordfish_cols:
-                                if (self.board.cells[row][col] is None and 
-                                    candidate in self.board.candidates[row][col]):
-                                    eliminations.append((row, col, candidate))
-                    
-                    if eliminations:
-                        return eliminations
+                # Eliminate the candidate from other cells in these rows
+                eliminations = []
+                for row in SET_BITS[all_rows]:
+                    for col in SET_BITS[candidate_positions[row] & ~swordfish_cols]:
+                        eliminations.append((row, col, candidate))
+                return eliminations
         
-        return None 
\ No newline at end of file
+        return None
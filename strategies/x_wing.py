@@ -1,7 +1,8 @@
-from typing import List, Optional, Tuple, Dict, Set
-from itertools import combinations
-from board.board import Board
+from typing import List, Optional, Tuple
+from board.board import Board, SET_BITS
 from strategies.strategy import Strategy
+from strategies._units import UnitType
+from strategies._kernels import find_x_wing
 
 class XWingStrategy(Strategy):
     """
@@ -33,6 +34,10 @@ class XWingStrategy(Strategy):
             board (Board): The Sudoku board to analyze
         """
         super().__init__(board, name="X-Wing Strategy", type="Candidate Eliminator")
+        # Per candidate, its row and column position masks when it last had no
+        # X-Wing in either direction; they are all an X-Wing depends on, so the
+        # candidate is skipped while they still match
+        self._candidate_misses: List[Optional[List[int]]] = [None] * 10
     
     def process(self) -> Optional[List[Tuple[int, int, int]]]:
         """
@@ -43,118 +48,71 @@ class XWingStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no X-Wing patterns are found.
         """
-        # First check for X-Wing patterns in rows
-        row_eliminations = self._find_x_wing_in_rows()
+        # Per candidate and unit, the cells holding it; a row's mask is indexed
+        # by column and a column's by row. Only rows and columns matter here.
+        positions = self.context.unit_positions
+        line_masks = [positions[candidate][:18] for candidate in range(10)]
+        
+        # Candidates whose rows and columns are unchanged since they last had no X-Wing
+        misses = self._candidate_misses
+        skip = 0
+        for candidate in range(1, 10):
+            if misses[candidate] == line_masks[candidate]:
+                skip |= 1 << candidate
+        
+        # First check for X-Wing patterns in rows, then in columns
+        row_eliminations = self._find_x_wing(line_masks, skip, transpose=False)
         if row_eliminations:
             return row_eliminations
         
-        # Then check for X-Wing patterns in columns
-        col_eliminations = self._find_x_wing_in_columns()
-        if col_eliminations:
-            return col_eliminations
-        
-        return None
+        return self._find_x_wing(line_masks, skip, transpose=True)
     
-    def _find_x_wing_in_rows(self) -> Optional[List[Tuple[int, int, int]]]:
+    def _find_x_wing(self, line_masks: List[List[int]], skip: int, transpose: bool) -> Optional[List[Tuple[int, int, int]]]:
         """
-        Find X-Wing patterns where the candidate appears exactly twice in each of two rows,
-        and these candidates are aligned in the same columns.
+        Find X-Wing patterns where the candidate appears exactly twice in each of two rows
+        (or columns), and these candidates are aligned in the same columns (or rows).
         
-        Returns:
-            Optional[List[Tuple[int, int, int]]]: List of eliminations if an X-Wing pattern is found,
-            None otherwise.
-        """
-        # For each candidate value
-        for candidate in range(1, 10):
-            # Find rows where the candidate appears exactly twice
-            rows_with_candidate_twice = []
-            row_to_cols = {}  # Maps row index to columns where candidate appears
-            
-            for row in range(9):
-                # Find columns in this row where the candidate appears
-                cols = [col for col in range(9) if 
-                        self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]]
-                
-                # If candidate appears exactly twice in this row
-                if len(cols) == 2:
-                    rows_with_candidate_twice.append(row)
-                    row_to_cols[row] = cols
-            
-            # Check all pairs of rows
-            for row1, row2 in combinations(rows_with_candidate_twice, 2):
-                # If the candidate appears in the same columns in both rows
-                if row_to_cols[row1] == row_to_cols[row2]:
-                    # We found an X-Wing pattern
-                    col1, col2 = row_to_cols[row1]
-                    
-                    # Find cells in these columns (excluding the X-Wing cells) where the candidate can be eliminated
-                    eliminations = []
-                    for row in range(9):
-                        if row != row1 and row != row2:
-                            # Check column 1
-                            if (self.board.cells[row][col1] is None and 
-                                candidate in self.board.candidates[row][col1]):
-                                eliminations.append((row, col1, candidate))
-                            
-                            # Check column 2
-                            if (self.board.cells[row][col2] is None and 
-                                candidate in self.board.candidates[row][col2]):
-                                eliminations.append((row, col2, candidate))
-                    
-                    if eliminations:
-                        return eliminations
+        Rows and columns only differ by which units of the per-unit position masks
+        are taken as base lines, so the column search is the same search with the
+        row and column unit offsets swapped.
         
-        return None
-    
-    def _find_x_wing_in_columns(self) -> Optional[List[Tuple[int, int, int]]]:
-        """
-        Find X-Wing patterns where the candidate appears exactly twice in each of two columns,
-        and these candidates are aligned in the same rows.
+        Args:
+            line_masks: Per candidate, the position masks of the 9 rows then the 9 columns
+            skip: Candidate bitmask of candidates known to have no X-Wing
+            transpose: Search columns (eliminating in rows) instead of rows
         
         Returns:
             Optional[List[Tuple[int, int, int]]]: List of eliminations if an X-Wing pattern is found,
             None otherwise.
         """
-        # For each candidate value
-        for candidate in range(1, 10):
-            # Find columns where the candidate appears exactly twice
-            cols_with_candidate_twice = []
-            col_to_rows = {}  # Maps column index to rows where candidate appears
-            
-            for col in range(9):
-                # Find rows in this column where the candidate appears
-                rows = [row for row in range(9) if 
-                        self.board.cells[row][col] is None and 
-                        candidate in self.board.candidates[row][col]]
-                
-                # If candidate appears exactly twice in this column
-                if len(rows) == 2:
-                    cols_with_candidate_twice.append(col)
-                    col_to_rows[col] = rows
-            
-            # Check all pairs of columns
-            for col1, col2 in combinations(cols_with_candidate_twice, 2):
-                # If the candidate appears in the same rows in both columns
-                if col_to_rows[col1] == col_to_rows[col2]:
-                    # We found an X-Wing pattern
-                    row1, row2 = col_to_rows[col1]
-                    
-                    # Find cells in these rows (excluding the X-Wing cells) where the candidate can be eliminated
-                    eliminations = []
-                    for col in range(9):
-                        if col != col1 and col != col2:
-                            # Check row 1
-                            if (self.board.cells[row1][col] is None and 
-                                candidate in self.board.candidates[row1][col]):
-                                eliminations.append((row1, col, candidate))
-                            
-                            # Check row 2
-                            if (self.board.cells[row2][col] is None and 
-                                candidate in self.board.candidates[row2][col]):
-                                eliminations.append((row2, col, candidate))
-                    
-                    if eliminations:
-                        return eliminations
+        if transpose:
+            line_offset, cross_offset = int(UnitType.COLUMN), int(UnitType.ROW)
+        else:
+            line_offset, cross_offset = int(UnitType.ROW), int(UnitType.COLUMN)
+        
+        found = find_x_wing(line_masks, line_offset, cross_offset, skip)
+        if transpose:
+            # The column search only runs once rows found nothing at all, so
+            # every candidate searched before the one found has no X-Wing
+            misses = self._candidate_misses
+            for candidate in range(1, found[0] if found else 10):
+                misses[candidate] = line_masks[candidate]
+        if found is None:
+            return None
+        
+        candidate, wing_lines, cross = found
+        candidate_positions = line_masks[candidate]
+        cross1, cross2 = SET_BITS[cross]
         
-        return None 
\ No newline at end of file
+        # Find cells in the two cross lines (excluding the X-Wing cells) where the candidate can be eliminated
+        eliminations = []
+        cross1_lines = candidate_positions[cross_offset + cross1]
+        cross2_lines = candidate_positions[cross_offset + cross2]
+        for line in SET_BITS[(cross1_lines | cross2_lines) & ~wing_lines]:
+            for cross_line, cross_lines in ((cross1, cross1_lines), (cross2, cross2_lines)):
+                if cross_lines >> line & 1:
+                    if transpose:
+                        eliminations.append((cross_line, line, candidate))
+                    else:
+                        eliminations.append((line, cross_line, candidate))
+        return eliminations
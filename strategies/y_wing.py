@@ -1,6 +1,6 @@
-from typing import List, Optional, Tuple, Dict, Set
-from itertools import combinations
-from board.board import Board
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from board.board import Board, PEER_MASKS
 from strategies.strategy import Strategy
 
 class YWingStrategy(Strategy):
@@ -40,20 +40,13 @@ class YWingStrategy(Strategy):
             value is a candidate that should be eliminated from the cell at (row, col).
             Returns None if no patterns are found.
         """
-        # Find all bi-value cells
-        bi_value_cells = self._find_bi_value_cells()
+        # Find all bi-value cells, indexed by their candidate pair
+        bi_value_cells, cells_by_pair = self._find_bi_value_cells()
         
         # For each potential pivot cell
         for pivot_row, pivot_col, pivot_candidates in bi_value_cells:
-            # Find potential wing cells
-            wing_cells = self._find_wing_cells(pivot_row, pivot_col, pivot_candidates, bi_value_cells)
-            
-            # For each pair of wing cells
-            for wing1, wing2 in combinations(wing_cells, 2):
-                # Check if the wing cells form a valid Y-Wing with the pivot
-                if not self._is_valid_ywing(pivot_row, pivot_col, pivot_candidates, wing1, wing2):
-                    continue
-                
+            # For each pair of wing cells forming a Y-Wing with the pivot
+            for wing1, wing2 in self._find_wing_pairs(pivot_row, pivot_col, pivot_candidates, cells_by_pair):
                 # Find eliminations based on this Y-Wing pattern
                 eliminations = self._find_eliminations(pivot_row, pivot_col, wing1, wing2)
                 if eliminations:
@@ -61,149 +54,114 @@ class YWingStrategy(Strategy):
         
         return None
     
-    def _find_bi_value_cells(self) -> List[Tuple[int, int, Set[int]]]:
+    def _find_bi_value_cells(self) -> Tuple[List[Tuple[int, int, int]], Dict[int, int]]:
         """
         Find all cells that have exactly two candidates.
         
         Returns:
-            List[Tuple[int, int, Set[int]]]: List of (row, col, candidates) for bi-value cells
+            Tuple[List[Tuple[int, int, int]], Dict[int, int]]: List of (row, col, candidate bitmask)
+            for bi-value cells, and a map from each candidate bitmask to the 81-bit mask of
+            the bi-value cells holding exactly that pair
         """
         bi_value_cells = []
-        for row in range(9):
-            for col in range(9):
-                if (self.board.cells[row][col] is None and 
-                    len(self.board.candidates[row][col]) == 2):
-                    bi_value_cells.append((row, col, self.board.candidates[row][col].copy()))
-        return bi_value_cells
+        cells_by_pair = defaultdict(int)
+        for index, cands in enumerate(self.board.candidates):
+            if cands.bit_count() == 2:
+                row, col = divmod(index, 9)
+                bi_value_cells.append((row, col, cands))
+                cells_by_pair[cands] |= 1 << index
+        return bi_value_cells, cells_by_pair
     
-    def _find_wing_cells(self, pivot_row: int, pivot_col: int, pivot_candidates: Set[int],
-                        bi_value_cells: List[Tuple[int, int, Set[int]]]) -> List[Tuple[int, int, Set[int]]]:
+    def _find_wing_pairs(self, pivot_row: int, pivot_col: int, pivot_candidates: int,
+                         cells_by_pair: Dict[int, int]) -> List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]:
         """
-        Find potential wing cells for a given pivot cell.
+        Find the pairs of wing cells that form a Y-Wing with a given pivot cell.
         
-        Args:
-            pivot_row: Row of the pivot cell
-            pivot_col: Column of the pivot cell
-            pivot_candidates: Candidates of the pivot cell
-            bi_value_cells: List of all bi-value cells
-        
-        Returns:
-            List[Tuple[int, int, Set[int]]]: List of potential wing cells
-        """
-        wing_cells = []
-        for row, col, candidates in bi_value_cells:
-            # Skip the pivot cell itself
-            if row == pivot_row and col == pivot_col:
-                continue
-            
-            # Check if this cell shares exactly one candidate with the pivot
-            shared_candidates = candidates.intersection(pivot_candidates)
-            if len(shared_candidates) == 1:
-                # Check if this cell can see the pivot
-                if self._cells_can_see_each_other((pivot_row, pivot_col), (row, col)):
-                    wing_cells.append((row, col, candidates))
-        
-        return wing_cells
-    
-    def _is_valid_ywing(self, pivot_row: int, pivot_col: int, pivot_candidates: Set[int],
-                        wing1: Tuple[int, int, Set[int]], wing2: Tuple[int, int, Set[int]]) -> bool:
-        """
-        Check if the wing cells form a valid Y-Wing with the pivot.
+        For a pivot {X,Y}, the wings are the pivot's peers holding exactly {X,Z}
+        and {Y,Z} for some candidate Z outside the pivot, so they are taken from
+        the bi-value cells grouped by pair instead of testing every bi-value cell.
         
         Args:
             pivot_row: Row of the pivot cell
             pivot_col: Column of the pivot cell
-            pivot_candidates: Candidates of the pivot cell
-            wing1: (row, col, candidates) of first wing cell
-            wing2: (row, col, candidates) of second wing cell
+            pivot_candidates: Candidate bitmask of the pivot cell
+            cells_by_pair: Map from candidate bitmask to the bi-value cells holding it
         
         Returns:
-            bool: True if valid Y-Wing, False otherwise
+            List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]: (wing1, wing2) pairs of
+            (row, col, candidate bitmask), ordered by the cell indices of the wings
         """
-        # Get the shared candidates between pivot and each wing
-        shared1 = pivot_candidates.intersection(wing1[2])
-        shared2 = pivot_candidates.intersection(wing2[2])
-        
-        # Wings must share different candidates with the pivot
-        if shared1 == shared2:
-            return False
-        
-        # Get the common candidate between the wing cells
-        common_candidate = wing1[2].intersection(wing2[2])
-        if len(common_candidate) != 1:
-            return False
-        
-        # The common candidate must not be in the pivot
-        if next(iter(common_candidate)) in pivot_candidates:
-            return False
-        
-        return True
-    
-    def _cells_can_see_each_other(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
-        """
-        Check if two cells can see each other (same row, column, or box).
-        
-        Args:
-            cell1: (row, col) of first cell
-            cell2: (row, col) of second cell
-        
-        Returns:
-            bool: True if cells can see each other, False otherwise
-        """
-        row1, col1 = cell1
-        row2, col2 = cell2
-        
-        # Check if in same row
-        if row1 == row2:
-            return True
-        
-        # Check if in same column
-        if col1 == col2:
-            return True
-        
-        # Check if in same box
-        box1_row, box1_col = row1 // 3, col1 // 3
-        box2_row, box2_col = row2 // 3, col2 // 3
-        if box1_row == box2_row and box1_col == box2_col:
-            return True
-        
-        return False
+        peers = PEER_MASKS[pivot_row * 9 + pivot_col]
+        x = pivot_candidates & -pivot_candidates
+        y = pivot_candidates ^ x
+        
+        # Peers holding {X,Z} and {Y,Z}, keyed by Z
+        x_wings_by_z = {}
+        y_wings_by_z = {}
+        for pair, cells in cells_by_pair.items():
+            cells &= peers
+            if cells:
+                shared = pair & pivot_candidates
+                if shared == x:
+                    x_wings_by_z[pair ^ x] = cells
+                elif shared == y:
+                    y_wings_by_z[pair ^ y] = cells
+        
+        wing_pairs = []
+        for z, x_wings in x_wings_by_z.items():
+            y_wings = y_wings_by_z.get(z)
+            if not y_wings:
+                continue
+            while x_wings:
+                low = x_wings & -x_wings
+                x_wings ^= low
+                wing1 = (low.bit_length() - 1, x | z)
+                remaining = y_wings
+                while remaining:
+                    low = remaining & -remaining
+                    remaining ^= low
+                    wing2 = (low.bit_length() - 1, y | z)
+                    wing_pairs.append((wing1, wing2) if wing1 < wing2 else (wing2, wing1))
+        
+        # Same order as taking cells pairwise in row-major order
+        wing_pairs.sort()
+        return [((i1 // 9, i1 % 9, c1), (i2 // 9, i2 % 9, c2)) for (i1, c1), (i2, c2) in wing_pairs]
     
     def _find_eliminations(self, pivot_row: int, pivot_col: int,
-                          wing1: Tuple[int, int, Set[int]], wing2: Tuple[int, int, Set[int]]) -> Optional[List[Tuple[int, int, int]]]:
+                          wing1: Tuple[int, int, int], wing2: Tuple[int, int, int]) -> Optional[List[Tuple[int, int, int]]]:
         """
         Find eliminations based on the Y-Wing pattern.
         
         Args:
             pivot_row: Row of the pivot cell
             pivot_col: Column of the pivot cell
-            wing1: (row, col, candidates) of first wing cell
-            wing2: (row, col, candidates) of second wing cell
+            wing1: (row, col, candidate bitmask) of first wing cell
+            wing2: (row, col, candidate bitmask) of second wing cell
         
         Returns:
             Optional[List[Tuple[int, int, int]]]: List of eliminations if found
         """
         # Get the common candidate between the wing cells
-        common_candidate = wing1[2].intersection(wing2[2])
+        common_candidate = wing1[2] & wing2[2]
         if not common_candidate:
             return None
         
-        common_candidate_value = next(iter(common_candidate))
+        common_candidate_value = common_candidate.bit_length() - 1
+        
+        # Cells that can see both wing cells, other than the pivot (the wings
+        # are not their own peers)
+        seen_by_both = (PEER_MASKS[wing1[0] * 9 + wing1[1]] & PEER_MASKS[wing2[0] * 9 + wing2[1]]
+                        & ~(1 << (pivot_row * 9 + pivot_col)))
         
-        # Find cells that can see both wing cells
+        # If such a cell has the common candidate, it can be eliminated
+        candidates = self.board.candidates
         eliminations = []
-        for row in range(9):
-            for col in range(9):
-                # Skip the pivot and wing cells
-                if (row, col) in [(pivot_row, pivot_col), (wing1[0], wing1[1]), (wing2[0], wing2[1])]:
-                    continue
-                
-                # Check if this cell can see both wing cells
-                if (self._cells_can_see_each_other((row, col), (wing1[0], wing1[1])) and 
-                    self._cells_can_see_each_other((row, col), (wing2[0], wing2[1]))):
-                    # If the cell has the common candidate, it can be eliminated
-                    if (self.board.cells[row][col] is None and 
-                        common_candidate_value in self.board.candidates[row][col]):
-                        eliminations.append((row, col, common_candidate_value))
+        while seen_by_both:
+            low = seen_by_both & -seen_by_both
+            seen_by_both ^= low
+            index = low.bit_length() - 1
+            if candidates[index] & common_candidate:
+                row, col = divmod(index, 9)
+                eliminations.append((row, col, common_candidate_value))
         
         return eliminations if eliminations else None
\ No newline at end of file
@@ -4,8 +4,11 @@ from typing import List, Any
 class SudokuLogger:
     """Centralized logger for the Sudoku solving process."""
 
-    def __init__(self, verbose: bool = False) -> None:
+    def __init__(self, verbose: bool = False, track_order: bool = True) -> None:
         self.verbose = verbose
+        # Without track_order only the per-strategy counts are kept, not the
+        # order strategies were found in
+        self.track_order = track_order
         self.step_counter = 0
         self.strategies_used: List[str] = []
         self.strategy_counts = {}
@@ -30,7 +33,8 @@ class SudokuLogger:
         print("\nStarting solving process..." if self.verbose else "\nStarting to solve...")
 
     def log_strategy_found(self, strategy_name: str, details: Any = None) -> None:
-        self.strategies_used.append(strategy_name)
+        if self.track_order:
+            self.strategies_used.append(strategy_name)
         self.strategy_counts[strategy_name] = self.strategy_counts.get(strategy_name, 0) + 1
         if self.verbose:
             print(f"Found strategy: {strategy_name}")
@@ -38,21 +42,6 @@ class SudokuLogger:
     def log_strategy_applied(self, strategy_name: str, updates: List, update_type: str | None = None) -> None:
         if update_type:
             self.step_counter += 1
-            if update_type == "elimination":
-                # formatted = [f"Candidate {v} from ({r}, {c})" for r, c, v in updates]
-                # print(f"Applied {strategy_name}: Eliminated {len(updates)} candidates")
-                # for text in formatted:
-                #     print(f"  {text}")
-                pass
-            else:
-                pass
-                # formatted = [f"Value {v} at ({r}, {c})" for r, c, v in updates]
-                # print(f"Applied {strategy_name}: Inserted {len(updates)} values")
-                # for text in formatted:
-                #     print(f"  {text}")
-        else:
-            # print(f"Applied {strategy_name}: {updates}")
-            pass
 
         if self.verbose and self.current_board:
             print("\nBoard after strategy:")
@@ -61,26 +50,30 @@ class SudokuLogger:
             self.current_board.display_candidates()
 
     def log_state_change(self, state: str, board) -> None:
-        if self.verbose:
-            print(f"\nState Machine: Current state = {state}")
-            print(f"Board valid: {board.is_valid()}")
-            print(f"Board solved: {board.is_solved()}")
-            print(f"Empty cells: {sum(1 for row in board.cells for cell in row if cell is None)}")
+        if not self.verbose:
+            return
+        print(f"\nState Machine: Current state = {state}")
+        print(f"Board valid: {board.is_valid()}")
+        print(f"Board solved: {board.is_solved()}")
+        print(f"Empty cells: {board.get_empty_count()}")
 
     def log_strategy_testing(self, strategy_name: str) -> None:
-        if self.verbose:
-            print(f"- Testing {strategy_name}...")
+        if not self.verbose:
+            return
+        print(f"- Testing {strategy_name}...")
 
     def log_strategy_not_found(self, strategy_name: str) -> None:
-        if self.verbose:
-            print(f"  No opportunities found for {strategy_name}")
+        if not self.verbose:
+            return
+        print(f"  No opportunities found for {strategy_name}")
 
     def log_no_strategies_found(self) -> None:
         print("No applicable strategies found" if self.verbose else "No more strategies can be applied")
 
     def log_solve_check(self, is_solved: bool) -> None:
-        if self.verbose:
-            print(f"Checking if solved: {is_solved}")
+        if not self.verbose:
+            return
+        print(f"Checking if solved: {is_solved}")
 
     def log_final_state(self, board, solved: bool) -> None:
         print("\nFinal board:")
@@ -89,18 +82,19 @@ class SudokuLogger:
         board.display_candidates()
         print(f"\nPuzzle {'solved' if solved else 'not solved'}")
         if not solved:
-            print(f"Remaining empty cells: {sum(1 for row in board.cells for cell in row if cell is None)}")
+            print(f"Remaining empty cells: {board.get_empty_count()}")
 
     def print_summary(self) -> None:
         print("\n===== Solving Summary =====")
         print(f"Total strategies applied: {self.step_counter}")
-        if self.strategies_used:
+        if self.strategy_counts:
             print("\nStrategies used by frequency:")
             for strategy, count in sorted(self.strategy_counts.items(), key=lambda x: x[1], reverse=True):
                 print(f"- {strategy}: {count} times")
-            print("\nStrategies used in order:")
-            for i, strategy in enumerate(self.strategies_used, 1):
-                print(f"{i}. {strategy}")
+            if self.track_order:
+                print("\nStrategies used in order:")
+                for i, strategy in enumerate(self.strategies_used, 1):
+                    print(f"{i}. {strategy}")
         else:
             print("No strategies were applied")
 
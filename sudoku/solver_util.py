@@ -22,8 +22,13 @@ class SolverUtil:
         description: str = "",
         solver_type: str = "Strategic",
         logger: Optional[SudokuLogger] = None,
+        track_order: bool = True,
     ) -> Dict[str, Any]:
-        """Solve a single puzzle and return detailed results."""
+        """Solve a single puzzle and return detailed results.
+
+        Callers that never read "strategies_used" can pass track_order=False so a
+        new logger only counts strategies instead of recording every one found.
+        """
         try:
             if description:
                 # print(f"\nSolving puzzle: {description}")
@@ -35,7 +40,7 @@ class SolverUtil:
             solver = SolverUtil.create_solver(board, mode="Default", solver_type=solver_type)
 
             if logger is None:
-                logger = SudokuLogger(verbose=verbose)
+                logger = SudokuLogger(verbose=verbose, track_order=track_order)
             else:
                 logger.verbose = verbose
 
@@ -55,7 +60,7 @@ class SolverUtil:
                 "solved": solved,
                 "board": board,
                 "strategies_used": logger.strategies_used,
-                "empty_cells": sum(1 for row in board.cells for cell in row if cell is None),
+                "empty_cells": board.get_empty_count(),
                 "logger": logger,
                 "inserted_values": logger.inserted_values,
 
@@ -1,5 +1,6 @@
 from board.board import Board
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import List, Optional
 
 
@@ -14,11 +15,10 @@ class BoardState:
 
     @classmethod
     def from_board(cls, board: Board, state_name: str) -> "BoardState":
-        empty_cells = sum(1 for row in board.cells for cell in row if cell is None)
         return cls(
             is_valid=board.is_valid(),
             is_solved=board.is_solved(),
-            empty_cells=empty_cells,
+            empty_cells=board.get_empty_count(),
             state_name=state_name,
         )
 
@@ -38,19 +38,34 @@ class Sudoku:
         return solved
 
 
+class SolverState(IntEnum):
+    """States of the solver state machine; the terminal states come last."""
+    FINDING_BEST_STRATEGY = 0
+    APPLYING_STRATEGY = 1
+    CHECKING_IF_SOLVED = 2
+    SOLVED = 3
+    UNSOLVABLE = 4
+
+
+# Name of each state as reported to the logger
+STATE_NAMES = tuple(state.name.lower() for state in SolverState)
+
+
 class SudokuStateMachine:
     def __init__(self, solver, logger=None) -> None:
         self.solver = solver
         self.logger = logger  # Use the new centralized logger
-        self.states = {
-            "finding_best_strategy": self.finding_best_strategy,
-            "applying_strategy": self.applying_strategy,
-            "checking_if_solved": self.checking_if_solved,
-            "solved": self.solved,
-            "unsolvable": self.unsolvable,
-        }
-        self.current_state = "finding_best_strategy"
+        # Handlers indexed by SolverState
+        self.states = (
+            self.finding_best_strategy,
+            self.applying_strategy,
+            self.checking_if_solved,
+            self.solved,
+            self.unsolvable,
+        )
+        self.current_state = SolverState.FINDING_BEST_STRATEGY
         self.no_strategy_count = 0  # Track consecutive no-strategy findings
+        self._log_solve_check = None  # Bound by solve when the logger is verbose
 
     def solve(self):
         """Main method to run the state machine until the puzzle is solved."""
@@ -58,44 +73,49 @@ class SudokuStateMachine:
             return self.solver.solve()
 
         # Set the board in the logger and log initial state
-        if self.logger:
-            self.logger.set_board(self.solver.board)
-            # self.logger.log_initial_state(self.solver.board)
-
-        while self.current_state not in ("solved", "unsolvable"):
+        logger = self.logger
+        if logger:
+            logger.set_board(self.solver.board)
+            # logger.log_initial_state(self.solver.board)
+
+        # State changes and solve checks are only logged in verbose mode, so
+        # bind those calls once instead of making them every transition
+        log_state_change = None
+        if logger and logger.verbose:
+            log_state_change = logger.log_state_change
+            self._log_solve_check = logger.log_solve_check
+
+        while self.current_state < SolverState.SOLVED:
             # Log state change
-            if self.logger:
-                self.logger.log_state_change(self.current_state, self.solver.board)
+            if log_state_change:
+                log_state_change(STATE_NAMES[self.current_state], self.solver.board)
 
             self.transition_state()
 
         # Log final state
-        if self.logger:
-            self.logger.log_state_change(self.current_state, self.solver.board)
+        if log_state_change:
+            log_state_change(STATE_NAMES[self.current_state], self.solver.board)
             # self.logger.log_final_state(
-            #     self.solver.board, self.current_state == "solved"
+            #     self.solver.board, self.current_state == SolverState.SOLVED
             # )
 
-        return self.current_state == "solved"
+        return self.current_state == SolverState.SOLVED
 
     def transition_state(self):
         """Transition between states based on the current state."""
-        if self.current_state in self.states:
-            self.states[self.current_state]()
-        else:
-            raise ValueError(f"Unknown state: {self.current_state}")
+        self.states[self.current_state]()
 
     def finding_best_strategy(self):
         """Determine the best strategy to apply next."""
         strategy_found, best_strategy = self.solver.find_strategy()
 
         if strategy_found:
-            self.current_state = "applying_strategy"
+            self.current_state = SolverState.APPLYING_STRATEGY
             self.no_strategy_count = 0  # Reset counter when strategy is found
         else:
             # Only mark as unsolvable if the board is invalid or we've tried too many times
             if not self.solver.board.is_valid() or self.no_strategy_count >= 1:
-                self.current_state = "unsolvable"
+                self.current_state = SolverState.UNSOLVABLE
                 # Only log no strategies found when transitioning to unsolvable
                 if self.logger:
                     self.logger.log_no_strategies_found()
@@ -103,7 +123,7 @@ class SudokuStateMachine:
                 # If no immediate strategy is found but board is valid,
                 # we might need more complex strategies
                 self.no_strategy_count += 1
-                self.current_state = "checking_if_solved"
+                self.current_state = SolverState.CHECKING_IF_SOLVED
 
     def applying_strategy(self):
         """Insert values into the board based on the chosen strategy."""
@@ -128,16 +148,19 @@ class SudokuStateMachine:
                 self.solver.current_strategy.name, updates, update_type
             )
 
-        self.current_state = "checking_if_solved"
+        self.current_state = SolverState.CHECKING_IF_SOLVED
 
     def checking_if_solved(self):
         """Verify if the sudoku is solved."""
-        is_solved = self.solver.board.is_solved()
+        # Strategy-based solvers insert through the board, which keeps
+        # filled_count current, so only a full board needs the validity scan
+        board = self.solver.board
+        is_solved = board.filled_count == 81 and board.is_solved()
         # Log solve check
-        if self.logger:
-            self.logger.log_solve_check(is_solved)
+        if self._log_solve_check:
+            self._log_solve_check(is_solved)
 
-        self.current_state = "solved" if is_solved else "finding_best_strategy"
+        self.current_state = SolverState.SOLVED if is_solved else SolverState.FINDING_BEST_STRATEGY
 
     def solved(self):
         # Stop
@@ -1,61 +1,279 @@
-from flask import Flask, request, render_template_string, jsonify, flash, redirect, url_for
+from flask import Flask, Request, request, render_template, jsonify, flash, redirect, url_for
 from werkzeug.utils import secure_filename
 import os
+import io
+import gzip
+from functools import lru_cache
+import threading
+import queue
+import time
 from datetime import datetime
-import imghdr
 import cv2
 import numpy as np
 
 import torch
-from digits_classifier.helper_functions_pt import MNISTClassifier, get_mnist_transform
-
-import imutils
-from image_processing import get_grid_dimensions, filter_non_square_contours, sort_grid_contours, reduce_noise, transform_grid, get_cells_from_9_main_cells
+# Optional, the classifier runs through ONNX Runtime when it and the exported .onnx model are available
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+from digits_classifier.helper_functions_pt import load_scripted_model, digits_to_batch
+
+from image_processing import get_grid_dimensions, filter_non_square_contours, sort_grid_cell_rects, reduce_noise, transform_grid, get_cells_from_9_main_cells
 from csp import csp, create_empty_board, BLANK_STATE
 from digits_classifier import sudoku_cells_reduce_noise
-from PIL import Image
 from sudoku.solver_util import SolverUtil
+from board._kernels import validate_cells
 
 
-device = "cpu"
-model = MNISTClassifier().to(device)
-
-state_dict = torch.load("digits_classifier/models/pt_cnn/ft_model_epoch12.pth", map_location=device)
-model.load_state_dict(state_dict)
-model.eval()
+# Run the whole-grid thresholding through OpenCV's OpenCL backend when a device is available
+use_opencl = cv2.ocl.haveOpenCL()
 
+# A request classifies at most 81 small 28x28 digits, more intra-op threads only
+# add launch overhead, and concurrent requests already run on their own threads
+torch.set_num_threads(2)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Only settable once, before any inter-op work, keep what an earlier import set up
+    pass
 
+device = "cpu"
+model_path = "digits_classifier/models/pt_cnn/ft_model_epoch12"
+
+if ort is not None and os.path.exists(model_path + ".onnx"):
+    # ONNX Runtime session of the model exported by digits_classifier/export_pt_server.py,
+    # its CPU provider fuses the graph and skips the torch dispatcher entirely
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session_options.intra_op_num_threads = 2
+    session_options.inter_op_num_threads = 1
+    onnx_session = ort.InferenceSession(model_path + ".onnx", session_options,
+                                        providers=["CPUExecutionProvider"])
+    model = None
+else:
+    onnx_session = None
+    # TorchScript compiled model, inference skips the per-op python dispatch.
+    # Load the one saved by digits_classifier/export_pt_server.py when present,
+    # otherwise quantize and script the trained state dict now
+    if os.path.exists(model_path + ".ts"):
+        model = torch.jit.load(model_path + ".ts", map_location=device)
+    else:
+        model = load_scripted_model(model_path + ".pth", device)
+    # optimize_for_inference freezes the graph and folds/fuses the conv layers
+    model = torch.jit.optimize_for_inference(model.eval())
+    # Never trained here, so no parameter needs autograd tracking
+    model.requires_grad_(False)
+
+def predict_digits(digit_batch):
+    """Predicted digit (1-9) of every image in the [N,1,28,28] batch"""
+    if onnx_session is not None:
+        logits = onnx_session.run(None, {"input": digit_batch.numpy()})[0]
+        return (logits.argmax(axis=1) + 1).tolist()
+    # inference_mode skips the autograd bookkeeping no_grad still does
+    with torch.inference_mode():
+        logits = model(digit_batch)
+    return (torch.argmax(logits, dim=1) + 1).tolist()
+
+# Input batch buffer of each server thread, big enough for a full board and reused by every request
+batch_buffers = threading.local()
+
+def get_batch_buffer():
+    if not hasattr(batch_buffers, 'batch'):
+        batch_buffers.batch = torch.empty(81, 1, 28, 28, dtype=torch.float32, device=device)
+    return batch_buffers.batch
+
+# Warm up at startup instead of on the first upload, the first TorchScript runs
+# profile and specialize the graph and pick the conv kernels
+try:
+    for _ in range(2):
+        predict_digits(torch.zeros(81, 1, 28, 28, device=device))
+except Exception as e:
+    print(f"Model warm up failed: {e}")
+
+# Digit batches of concurrent uploads are classified together by one background thread,
+# under load the forward pass runs on a few hundred digits instead of many batches of <= 81
+CLASSIFY_WAIT = 0.01  # Seconds to wait for other uploads after the first batch arrives
+CLASSIFY_TIMEOUT = 30  # Seconds a request waits for its predictions before giving up
+classify_queue = queue.Queue()
+classifier_lock = threading.Lock()
+classifier_thread = None
+# Requests currently waiting on the classifier, only then is it worth waiting to coalesce batches
+in_flight = 0
+
+class ClassifyJob:
+    __slots__ = ('batch', 'done', 'predictions', 'error')
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.done = threading.Event()
+        self.predictions = None
+        self.error = None
+
+def classifier_worker():
+    while True:
+        jobs = [classify_queue.get()]
+        # A lone upload is classified right away, with others in flight wait a moment for their batches
+        deadline = time.monotonic() + CLASSIFY_WAIT
+        while len(jobs) < in_flight and (timeout := deadline - time.monotonic()) > 0:
+            try:
+                jobs.append(classify_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        try:
+            # cat copies the batches, so each request thread may reuse its buffer once done is set
+            predictions = predict_digits(torch.cat([job.batch for job in jobs]))
+            start = 0
+            for job in jobs:
+                end = start + len(job.batch)
+                job.predictions = predictions[start:end]
+                start = end
+        except Exception as e:
+            for job in jobs:
+                job.error = e
+        finally:
+            for job in jobs:
+                job.done.set()
+
+def start_classifier():
+    """Start this process's classifier thread unless it is already running"""
+    global classifier_thread
+    with classifier_lock:
+        if classifier_thread is None or not classifier_thread.is_alive():
+            classifier_thread = threading.Thread(target=classifier_worker, name='digit-classifier', daemon=True)
+            classifier_thread.start()
+
+def reset_classifier():
+    """A forked worker inherits the queue and lock but not the thread, start over with fresh ones"""
+    global classify_queue, classifier_lock, classifier_thread, in_flight
+    classify_queue = queue.Queue()
+    classifier_lock = threading.Lock()
+    classifier_thread = None
+    in_flight = 0
+
+# Fork-after-import servers (e.g. gunicorn --preload) start their classifier on the first upload
+os.register_at_fork(after_in_child=reset_classifier)
+
+def classify_digits(digit_batch):
+    """Predicted digit (1-9) of every image in the [N,1,28,28] batch, blocks until classified"""
+    global in_flight
+    start_classifier()
+    job = ClassifyJob(digit_batch)
+    with classifier_lock:
+        in_flight += 1
+    try:
+        classify_queue.put(job)
+        if not job.done.wait(CLASSIFY_TIMEOUT):
+            raise RuntimeError('Digit classifier did not respond')
+    finally:
+        with classifier_lock:
+            in_flight -= 1
+    if job.error is not None:
+        raise job.error
+    return job.predictions
+
+
+
+class UploadRequest(Request):
+    """Request that keeps uploaded files in memory instead of spooling them to a temporary file"""
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Bounded by MAX_CONTENT_LENGTH, and a BytesIO lets the image be decoded from its buffer
+        return io.BytesIO()
 
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
 
 # Allowed image extensions
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
 
+# Images wider than this are shrunk before extracting the grid
+MAX_IMAGE_WIDTH = 700
+
+# A cell with fewer ink pixels than this in its central half is treated as empty
+EMPTY_CELL_MAX_PIXELS = 5
+
+# JPEGs are decoded at 1/8, 1/4 or 1/2 scale when that still leaves MAX_IMAGE_WIDTH
+REDUCED_DECODE_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                        (4, cv2.IMREAD_REDUCED_COLOR_4),
+                        (2, cv2.IMREAD_REDUCED_COLOR_2))
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def validate_image(stream):
-    """Validate that the uploaded file is actually an image"""
-    header = stream.read(512)
-    stream.seek(0)
-    format = imghdr.what(None, header)
-    if not format:
+def get_jpeg_size(data):
+    """Read (width, height) from the frame header of JPEG bytes, None if it is not a JPEG"""
+    if data[:2] != b'\xff\xd8':
         return None
-    return '.' + (format if format != 'jpeg' else 'jpg')
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            # Fill byte
+            i += 1
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Markers without a length
+            i += 2
+        elif 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            # Start of frame: length, precision, height, width
+            return int.from_bytes(data[i + 7:i + 9], 'big'), int.from_bytes(data[i + 5:i + 7], 'big')
+        else:
+            i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+def decode_image(data):
+    """
+    Decode uploaded image bytes with OpenCV, None if they are not an image
+    Large JPEGs are scaled down inside the decoder (scaled IDCT), since process_img
+    shrinks them to MAX_IMAGE_WIDTH anyway
+    """
+    flag = cv2.IMREAD_COLOR
+    size = get_jpeg_size(data)
+    if size:
+        # Smaller side, so the width is still big enough if EXIF rotates the image
+        shortest = min(size)
+        for factor, reduced_flag in REDUCED_DECODE_FLAGS:
+            if shortest // factor >= MAX_IMAGE_WIDTH:
+                flag = reduced_flag
+                break
+    return cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+
+# Maps the ASCII digits of a sudoku string to their values
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
 
 def format_sudoku_board(sudoku_string):
     """Convert sudoku string to 9x9 board format"""
     if len(sudoku_string) != 81:
         return None
     
-    board = []
-    for i in range(0, 81, 9):
-        row = [int(digit) if digit != '0' else 0 for digit in sudoku_string[i:i+9]]
-        board.append(row)
-    return board
+    # Decode every digit in one translate, then split into rows of 9
+    values = sudoku_string.encode('ascii').translate(DIGIT_VALUES)
+    return [list(values[i:i + 9]) for i in range(0, 81, 9)]
+
+@lru_cache(maxsize=256)
+def render_board_html(sudoku_string):
+    """HTML of the 9x9 board cells, built in python instead of 81 template loop iterations"""
+    rows = []
+    for row_idx in range(9):
+        cells = []
+        for col_idx in range(9):
+            digit = sudoku_string[row_idx * 9 + col_idx]
+            classes = 'sudoku-cell'
+            if digit == '0':
+                classes += ' empty'
+            if col_idx in (2, 5):
+                classes += ' thick-right'
+            if row_idx in (2, 5):
+                classes += ' thick-bottom'
+            cells.append(f'<div class="{classes}" id="cell-{row_idx}-{col_idx}">'
+                         f'{digit if digit != "0" else "·"}</div>')
+        rows.append(f'<div class="sudoku-row">{"".join(cells)}</div>')
+    return ''.join(rows)
 
 # HTML template
 HTML_TEMPLATE = '''
@@ -302,23 +520,7 @@ HTML_TEMPLATE = '''
             <h3>✅ Sudoku Board Extracted Successfully!</h3>
             
             <div class="sudoku-board">
-                {% for row_idx in range(9) %}
-                <div class="sudoku-row">
-                    {% for col_idx in range(9) %}
-                    <div class="sudoku-cell 
-                        {% if sudoku_board[row_idx][col_idx] == 0 %}empty{% endif %}
-                        {% if col_idx in [2, 5] %}thick-right{% endif %}
-                        {% if row_idx in [2, 5] %}thick-bottom{% endif %}"
-                        id="cell-{{ row_idx }}-{{ col_idx }}">
-                        {% if sudoku_board[row_idx][col_idx] != 0 %}
-                            {{ sudoku_board[row_idx][col_idx] }}
-                        {% else %}
-                            ·
-                        {% endif %}
-                    </div>
-                    {% endfor %}
-                </div>
-                {% endfor %}
+                {{ board_html|safe }}
             </div>
             
             {% if solving_steps %}
@@ -500,10 +702,16 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# Compile the page once, render_template_string would parse it again on every request
+PAGE_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
 def process_img(img):
     image = img
-    if image.shape[1] > 700:
-        image = imutils.resize(image, width=700)
+    height, width = image.shape[:2]
+    if width > MAX_IMAGE_WIDTH:
+        # Area interpolation, faster than bilinear when shrinking and keeps thin digit strokes
+        new_height = int(height * MAX_IMAGE_WIDTH / width)
+        image = cv2.resize(image, (MAX_IMAGE_WIDTH, new_height), interpolation=cv2.INTER_AREA)
     grid_coordinates = get_grid_dimensions(image)
 
     grid = transform_grid(image, grid_coordinates)
@@ -528,16 +736,13 @@ def process_img(img):
             # Split main cells to 81 cells
             cnts = get_cells_from_9_main_cells(cnts)
         else:
-            new_cnts = []
-
             # In between, not sure if this is a valid grid
             # Sort hierarchy, toss small contours to find main cells
             # Only accept contours with hierarchy 0 (main contours)
             # Format of hierarchy: [next, previous, child, parent]
-            for cnt, hie in zip(cnts, hierarchy[0]):
-                # Check if parent is -1 (Does not exist)
-                if hie[3] == -1:
-                    new_cnts.append(cnt)
+            # Check if parent is -1 (Does not exist), paired up with cnts by position
+            parents = hierarchy[0][:len(cnts), 3]
+            new_cnts = [cnts[i] for i in np.flatnonzero(parents == -1)]
 
             if len(new_cnts) == 9:
                 # Got all main cells
@@ -553,55 +758,72 @@ def process_img(img):
         cnts_len = len(cnts)
 
         # Success detection of grid & cells
-        # Sort grid into nested list format same as sudoku
-        grid_contours = sort_grid_contours(cnts)
+        # Sort grid into nested list format same as sudoku, as cell bounding boxes
+        grid_rects = sort_grid_cell_rects(cnts)
 
         # Create a blank Sudoku board
         board = create_empty_board()
 
-        # Run digit classifier
-        for row_index, row in enumerate(grid_contours):
-            for box_index, box in enumerate(row):
+        # Convert to greyscale, image thresholding & invert image, once for the whole grid
+        # Through a UMat this runs on the OpenCL device, back to numpy for slicing the cells
+        grid_gray = cv2.cvtColor(cv2.UMat(grid) if use_opencl else grid, cv2.COLOR_BGR2GRAY)
+        grid_inv = cv2.adaptiveThreshold(grid_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                         cv2.THRESH_BINARY_INV, 27, 11)
+        if use_opencl:
+            grid_inv = grid_inv.get()
 
-                # Extract cell ROI from contour
-                x, y, width, height = cv2.boundingRect(box)
-                roi = grid[y:y + height, x:x + width]
+        # Collect the digits first, classify them in one batch afterwards
+        digits = []
+        positions = []
+        for row_index, row in enumerate(grid_rects):
+            for box_index, (x, y, width, height) in enumerate(row):
 
-                # Convert to greyscale
-                roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+                # Extract thresholded cell ROI
+                digit_inv = grid_inv[y:y + height, x:x + width]
 
-                # Image thresholding & invert image
-                digit_inv = cv2.adaptiveThreshold(roi, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                                    cv2.THRESH_BINARY_INV, 27, 11)
+                # Empty cell, hardly any ink in its central half, skip the contour search
+                core = digit_inv[height // 4:3 * height // 4, width // 4:3 * width // 4]
+                if cv2.countNonZero(core) < EMPTY_CELL_MAX_PIXELS:
+                    continue
 
                 # Remove surrounding noise
                 digit = sudoku_cells_reduce_noise(digit_inv)
 
                 # Digit present
                 if digit is not None:
-                    # Make prediction
-                    digit = Image.fromarray(digit)
-                    # Reshape to fit model input, [1,28,28]
-                    digit_tensor = get_mnist_transform()(digit)
-                    # Add batch dim, send to device
-                    digit_tensor = digit_tensor.unsqueeze(0).to(device)
-                    with torch.no_grad():
-                        logits = model(digit_tensor)
-                        board[row_index][box_index] = torch.argmax(logits, dim=1).item() + 1
+                    digits.append(digit)
+                    positions.append((row_index, box_index))
+
+        # Run digit classifier, a single forward pass for every digit found
+        if digits:
+            # Reshape to fit model input, [N,1,28,28], written into this thread's buffer on device
+            digit_batch = digits_to_batch(np.stack(digits), out=get_batch_buffer())
+            predictions = classify_digits(digit_batch)
+            for (row_index, box_index), prediction in zip(positions, predictions):
+                board[row_index][box_index] = prediction
     
-    sudoku_string = ''                    
-    for row in board:
-        for digit in row:
-            sudoku_string += str(digit)
+    sudoku_string = ''.join(str(digit) for row in board for digit in row)
+
+    # A misread digit can repeat in a row, column or box, such a board has no
+    # solution, so show it without solving steps instead of running the solver
+    if not validate_cells(board):
+        return (sudoku_string, [])
     
+    return (sudoku_string, list(solve_inserted_values(sudoku_string)))
+
+# Repeat uploads of the same puzzle (retries, demos) reuse the solving steps
+@lru_cache(maxsize=256)
+def solve_inserted_values(sudoku_string):
     solver ="Strategic"
     solving_steps = SolverUtil.solve_puzzle(
             sudoku_string,
             verbose=False,
             description='xd',
             solver_type=solver,
+            track_order=False,
         )
-    return (sudoku_string, solving_steps['inserted_values'])
+    # Tuple so the cached steps cannot be changed by a caller
+    return tuple(solving_steps['inserted_values'])
 
 @app.route('/', methods=['GET', 'POST'])
 def upload_file():
@@ -625,20 +847,18 @@ def upload_file():
             return redirect(url_for('upload_file'))
         
         if file and allowed_file(file.filename):
-            # Validate that it's actually an image
-            file_ext = validate_image(file.stream)
-            if not file_ext:
-                flash('Invalid image file! Please upload a valid image.')
-                return redirect(url_for('upload_file'))
-
-            
             try:
-                # Load image directly into OpenCV without saving to disk
-                file_bytes = np.frombuffer(file.read(), np.uint8)
-                cv_image = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
+                # Load image directly into OpenCV without saving to disk, from the
+                # upload's own buffer when it is in memory, without copying it to bytes
+                if hasattr(file.stream, 'getbuffer'):
+                    with file.stream.getbuffer() as data:
+                        cv_image = decode_image(data)
+                else:
+                    cv_image = decode_image(file.stream.read())
                 
+                # Validate that it's actually an image, imdecode rejects anything else
                 if cv_image is None:
-                    flash('Could not process image file!')
+                    flash('Invalid image file! Please upload a valid image.')
                     return redirect(url_for('upload_file'))
 
                 
@@ -669,18 +889,48 @@ def upload_file():
             flash('Invalid file type! Please upload an image file (PNG, JPG, JPEG, GIF, BMP, WEBP).')
             return redirect(url_for('upload_file'))
     
-    return render_template_string(HTML_TEMPLATE, 
-                                sudoku_board=sudoku_board,
-                                sudoku_string=sudoku_string,
-                                solving_steps=solving_steps,
-                                upload_time=upload_time,
-                                image_info=image_info)
+    return render_template(PAGE_TEMPLATE, 
+                         sudoku_board=sudoku_board,
+                         board_html=render_board_html(sudoku_string) if sudoku_board else None,
+                         sudoku_string=sudoku_string,
+                         solving_steps=solving_steps,
+                         upload_time=upload_time,
+                         image_info=image_info)
 
 @app.errorhandler(413)
 def too_large(e):
     flash('File too large! Maximum size is 5MB.')
     return redirect(url_for('upload_file'))
 
+@app.after_request
+def compress_page(response):
+    """Gzip the HTML page for clients that accept it, the inlined template is mostly markup"""
+    if (response.mimetype == 'text/html'
+            and response.status_code == 200
+            and not response.direct_passthrough
+            and 'Content-Encoding' not in response.headers
+            and request.accept_encodings.quality('gzip') > 0):
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    return response
+
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # For production run one worker process per core, the model loads at import so
+    # each worker has it ready before serving, and torch's thread cap above keeps
+    # the workers from oversubscribing the cores:
+    #   gunicorn -w $(nproc) -k gthread --threads 2 -b 0.0.0.0:5000 website:app
+    try:
+        # Production WSGI server with a thread pool, decoding, OpenCV and inference
+        # release the GIL so concurrent uploads overlap
+        from waitress import serve
+    except ImportError:
+        serve = None
+
+    if serve is not None:
+        serve(app, host='0.0.0.0', port=5000, threads=4)
+    else:
+        # Development server, one thread per request. The debug reloader is left off:
+        # it runs the app in a second process, loading and warming up the model twice.
+        app.run(host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file